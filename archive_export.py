@@ -0,0 +1,173 @@
+"""Stream rendered datasheets into a single ZIP archive, one folder per language.
+
+One archive instead of thousands of small files saves the per-file cost of
+network shares. New PDFs are collected in memory and written together at a
+checkpoint (every ``CHECKPOINT_ENTRIES`` entries or ``CHECKPOINT_BYTES``)
+with a new central directory, so between checkpoints the file on disk is a
+valid ZIP and a killed run loses at most the entries since the last one.
+Only a kill during the checkpoint write itself leaves the central directory
+broken; the next ``ZipExporter`` on the same path then rebuilds the archive
+from the complete entries before appending.
+"""
+import os
+import struct
+import threading
+import warnings
+import zipfile
+import zlib
+
+CHECKPOINT_ENTRIES = 25
+CHECKPOINT_BYTES = 64 * 1024 * 1024
+# rewrite the archive on close once replaced entries take up this share of it
+COMPACT_RATIO = 0.25
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def _complete_entries(path):
+    """Yield ``(name, method, data)`` for every fully written entry, reading local headers only."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = 0
+        while pos + _LOCAL_HEADER.size <= size:
+            f.seek(pos)
+            header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            signature, _, flags, method, _, _, _, compressed_size, _, name_len, extra_len = header
+            # entries written with a data descriptor have no sizes up front
+            if signature != _LOCAL_HEADER_SIGNATURE or flags & 0x08:
+                break
+            name = f.read(name_len).decode("utf-8" if flags & 0x800 else "cp437")
+            data_start = pos + _LOCAL_HEADER.size + name_len + extra_len
+            if data_start + compressed_size > size:
+                break
+            f.seek(data_start)
+            yield name, method, f.read(compressed_size)
+            pos = data_start + compressed_size
+
+
+def _is_intact(path):
+    """Tell whether the central directory of ``path`` can be read.
+
+    An append killed midway leaves the old end record at the end of the
+    file, pointing to a central directory that the new entry overwrote, so
+    ``zipfile.is_zipfile`` alone is not enough.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            archive.namelist()
+    except (zipfile.BadZipFile, OSError, EOFError, ValueError):
+        return False
+    return True
+
+
+def recover_archive(path):
+    """Rewrite a ZIP left without central directory by a crash; returns the number of entries kept."""
+    tmp = f"{path}.recover"
+    count = 0
+    with zipfile.ZipFile(tmp, "w") as out:
+        for name, method, data in _complete_entries(path):
+            if method == zipfile.ZIP_DEFLATED:
+                data = zlib.decompressobj(-15).decompress(data)
+            elif method != zipfile.ZIP_STORED:
+                break
+            out.writestr(name, data, compress_type=method)
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+class ZipExporter:
+    """Append datasheets to a ZIP archive as ``<lang>/<filename>`` entries.
+
+    Existing archives are continued, and entries that are already present
+    are skipped, so an interrupted run can write into the same file again.
+    With ``replace`` an entry is written again; readers take the last one,
+    and the older copies are dropped on ``close`` once they take up more
+    than ``COMPACT_RATIO`` of the archive. ``on_checkpoint(names)`` is called
+    with the entries each checkpoint has made durable.
+    """
+
+    def __init__(self, path, compression=zipfile.ZIP_STORED, on_checkpoint=None):
+        self.path = os.fspath(path)
+        self.compression = compression
+        self.on_checkpoint = on_checkpoint
+        self._lock = threading.Lock()
+        self._pending = {}          # entry name -> PDF bytes, written at the next checkpoint
+        self._pending_size = 0
+        self._sizes = {}            # entry name -> size of its last copy in the archive
+        self._superseded = 0        # bytes taken up by replaced copies
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            if not _is_intact(self.path):
+                recover_archive(self.path)
+            with zipfile.ZipFile(self.path) as archive:
+                for info in archive.infolist():
+                    self._superseded += self._sizes.get(info.filename, 0)
+                    self._sizes[info.filename] = info.compress_size
+        else:
+            # an empty archive, so the file is a valid ZIP from the start
+            zipfile.ZipFile(self.path, "w").close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self._sizes or name in self._pending
+
+    @staticmethod
+    def entry_name(lang, filename):
+        return f"{lang or 'de'}/{filename}"
+
+    def add(self, lang, filename, data, replace=False):
+        """Queue one PDF; returns the entry name, or None if it was already in the archive (unless ``replace``).
+
+        The entry is on disk after the next checkpoint, which may be this call.
+        """
+        name = self.entry_name(lang, filename)
+        with self._lock:
+            if name in self and not replace:
+                return None
+            self._pending_size += len(data) - len(self._pending.get(name, b""))
+            self._pending[name] = data
+            full = len(self._pending) >= CHECKPOINT_ENTRIES or self._pending_size >= CHECKPOINT_BYTES
+        if full:
+            self.checkpoint()
+        return name
+
+    def checkpoint(self):
+        """Write the queued entries and a new central directory; returns their names."""
+        with self._lock:
+            pending, self._pending, self._pending_size = self._pending, {}, 0
+            if not pending:
+                return []
+            with zipfile.ZipFile(self.path, "a", compression=self.compression) as archive:
+                with warnings.catch_warnings():
+                    # a replaced entry is a duplicate name on purpose
+                    warnings.simplefilter("ignore", UserWarning)
+                    for name, data in pending.items():
+                        archive.writestr(name, data)
+                        self._superseded += self._sizes.get(name, 0)
+                        self._sizes[name] = archive.getinfo(name).compress_size
+        if self.on_checkpoint is not None:
+            self.on_checkpoint(list(pending))
+        return list(pending)
+
+    def compact(self):
+        """Rewrite the archive with only the last copy of every entry."""
+        with self._lock:
+            tmp = f"{self.path}.compact"
+            with zipfile.ZipFile(self.path) as source, zipfile.ZipFile(tmp, "w") as out:
+                # the last copy of a name wins
+                latest = {info.filename: info for info in source.infolist()}
+                for info in latest.values():
+                    out.writestr(info, source.read(info))
+            os.replace(tmp, self.path)
+            self._superseded = 0
+
+    def close(self):
+        self.checkpoint()
+        if self._superseded > COMPACT_RATIO * os.path.getsize(self.path):
+            self.compact()
@@ -0,0 +1,121 @@
+"""Render many datasheets across a pool of worker processes.
+
+ReportLab layout is pure-Python CPU work, so a single process keeps one core
+busy. Each worker builds the ``DatasheetTemplate`` once and keeps its image
+caches warm for all records it renders.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import submit_bounded
+
+
+def _init_worker():
+    from datasheet_template import get_template
+    get_template()
+
+
+def _render_one(record, save_folder):
+    from datasheet_template import get_template
+
+    start = time.perf_counter()
+    try:
+        output_filename = get_template().render(*record, save_folder=save_folder)
+    except Exception as e:
+        # exceptions are not always picklable, send the message back instead
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return output_filename, None, time.perf_counter() - start
+
+
+def _render_bytes_one(record, version=None):
+    from datasheet_template import get_template
+
+    start = time.perf_counter()
+    try:
+        template = get_template()
+        filename = template.output_filename(record[0], record[5], "")
+        data = template.render_bytes(*record, version=version)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return (filename, data), None, time.perf_counter() - start
+
+
+def _run_pool(records, task, task_args, max_workers, extra_args=None):
+    """Run ``task(record, *task_args)`` in worker processes, yielding ``(record, result, error, seconds)``.
+
+    ``extra_args(record)``, if given, returns further per-record arguments.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    # spawn, not fork: the records may come from a generator that downloads in threads, and a
+    # forked worker would inherit their held locks and in-flight downloads (Windows spawns anyway)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker) as pool:
+        def submit(record):
+            args = (*task_args, *extra_args(record)) if extra_args else task_args
+            return pool.submit(task, tuple(record), *args)
+
+        for record, future in submit_bounded(records, submit, max_workers * 2):
+            try:
+                result, error, seconds = future.result()
+            except Exception as e:
+                # the worker process itself died
+                result, error, seconds = None, f"{type(e).__name__}: {e}", 0.0
+            yield record, result, error, seconds
+
+
+def render_batch(records, save_folder, max_workers=None):
+    """Render scraped product records in worker processes.
+
+    ``records`` is an iterable of the tuples returned by ``get_emico_data``
+    and is consumed lazily. Yields ``(record, output_filename, error,
+    seconds)`` in completion order; ``error`` is None on success.
+    """
+    yield from _run_pool(records, _render_one, (save_folder,), max_workers)
+
+
+def render_batch_bytes(records, max_workers=None, version_for=None):
+    """Like ``render_batch``, but return the PDFs instead of writing them.
+
+    Yields ``(record, (filename, pdf_bytes), error, seconds)``; the second
+    item is None if rendering failed. ``version_for(record)`` may return the
+    footer version stamp of a record (None for the current month).
+    """
+    extra_args = (lambda record: (version_for(record),)) if version_for else None
+    yield from _run_pool(records, _render_bytes_one, (), max_workers, extra_args)
+
+
+def render_batch_to_archive(records, archive_path, max_workers=None):
+    """Like ``render_batch``, but stream all datasheets into one ZIP archive.
+
+    Entries are named ``<lang>/<filename>`` and written at the archive's
+    checkpoints. Records whose entry is already in the archive are not
+    rendered again. Yields ``(record, entry_name, error, seconds)``;
+    ``entry_name`` is None for datasheets already in the archive.
+    """
+    from archive_export import ZipExporter
+    from datasheet_template import get_template
+
+    template = get_template()
+    skipped = []
+
+    def unwritten(archive):
+        for record in records:
+            filename = template.output_filename(record[0], record[5], "")
+            if ZipExporter.entry_name(record[5], filename) in archive:
+                skipped.append(record)
+            else:
+                yield record
+
+    with ZipExporter(archive_path) as archive:
+        for record, result, error, seconds in render_batch_bytes(unwritten(archive), max_workers):
+            while skipped:
+                yield skipped.pop(0), None, None, 0.0
+            entry_name = None
+            if error is None:
+                filename, data = result
+                entry_name = archive.add(record[5], filename, data)
+            yield record, entry_name, error, seconds
+        while skipped:
+            yield skipped.pop(0), None, None, 0.0
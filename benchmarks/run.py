@@ -0,0 +1,251 @@
+"""Offline benchmark suite: parse, render, end-to-end and batch throughput.
+
+Everything runs against the local stand-in (``benchmarks/standin.py``) with
+a throw-away cache folder, so no network access is needed and the user's
+caches are left alone. Each run is appended to a results file (by default
+``results.jsonl`` under ``cache_dir("benchmarks")``) together with the git
+commit, and compared with the previous run or a given commit.
+
+    python -m benchmarks.run [--quick] [--latency 0.05] [--compare COMMIT]
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils import LANGUAGES, cache_dir
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+RESULTS_FILE = cache_dir("benchmarks") / "results.jsonl"
+# relative change above which a metric is flagged in the comparison
+THRESHOLD = 0.10
+
+
+def _median(values):
+    return round(statistics.median(values), 4) if values else None
+
+
+def _trace_stages(trace):
+    return {name: entry["seconds"] for name, entry in trace.stages.items()}
+
+
+def _page_url(lang, part_number):
+    return f"https://www.emico.com/{lang}-DE/emico/o-ring-{part_number}"
+
+
+# === Benchmarks ===
+def bench_parse(repeat):
+    """Median seconds per stage of ``get_emico_data`` for a fresh page fetch, per language."""
+    import timing
+    from main import get_emico_data
+
+    results = {}
+    for lang in LANGUAGES:
+        fetch, parse = [], []
+        for i in range(repeat):
+            with timing.trace("bench") as trace:
+                get_emico_data(_page_url(lang, 400000000 + i), cache_mode="fresh")
+            stages = _trace_stages(trace)
+            fetch.append(stages["fetch"])
+            parse.append(stages["parse"])
+        results[lang] = {"fetch_s": _median(fetch), "parse_s": _median(parse)}
+    return results
+
+
+def bench_render(repeat, out_dir):
+    """Median ``generate_emico_pdf`` time (images already cached), its stages and the PDF size."""
+    import timing
+    from main import get_emico_data
+    from pdf_generator import generate_emico_pdf
+
+    record = get_emico_data(_page_url("de", 410000000))
+    seconds, stages, size = [], {}, 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(repeat + 1):
+            with timing.trace("bench") as trace:
+                output = generate_emico_pdf(*record, save_folder=out_dir)
+            # the first run fills the image caches and is not counted
+            if i > 0:
+                seconds.append(trace.seconds)
+                for name, value in _trace_stages(trace).items():
+                    stages.setdefault(name, []).append(value)
+            size = os.path.getsize(output)
+    return {"render_s": _median(seconds), "pdf_bytes": size,
+            "stages_s": {name: _median(values) for name, values in stages.items()}}
+
+
+def bench_end_to_end(repeat, out_dir):
+    """Median latency of scraping and rendering one new product, nothing cached."""
+    from main import get_emico_data
+    from pdf_generator import generate_emico_pdf
+
+    seconds = []
+    for i in range(repeat):
+        # a new part number has its own page and image URLs (and image bytes), so nothing is cached
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            record = get_emico_data(_page_url("de", 420000000 + i), cache_mode="fresh")
+            generate_emico_pdf(*record, save_folder=out_dir)
+        seconds.append(time.perf_counter() - start)
+    return {"latency_s": _median(seconds), "min_s": round(min(seconds), 4)}
+
+
+def bench_batch(items, levels, work_dir):
+    """Throughput of ``generate_all.run_batch`` for each concurrency level (fetch threads / render processes)."""
+    import openpyxl
+    import generate_all
+
+    results = {}
+    for level in levels:
+        base = 500000000 + level * 10000
+        part_numbers = [str(base + i) for i in range(items)]
+        folder = Path(work_dir) / f"batch_{level}"
+        folder.mkdir(parents=True, exist_ok=True)
+        link_file = folder / "links.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "url"
+        sheet.append(["loc", "Spalte1"])
+        for part_number in part_numbers:
+            sheet.append([_page_url("de", part_number), part_number])
+        workbook.save(link_file)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = generate_all.run_batch(
+                part_numbers, str(folder / "out"), link_file=str(link_file), max_workers=level,
+                render_workers=min(level, os.cpu_count() or 1), cache_mode="fresh",
+            )
+        seconds = time.perf_counter() - start
+        results[str(level)] = {"seconds": round(seconds, 3), "items_per_s": round(summary["written"] / seconds, 3),
+                               "failed": summary["failed"]}
+    return results
+
+
+# === Results ===
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(metrics, prefix=""):
+    flat = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def load_results(path=RESULTS_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def save_result(result, path=RESULTS_FILE):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def compare(baseline, result):
+    """Return lines comparing all metrics with ``baseline``; regressions beyond ``THRESHOLD`` are marked."""
+    old, new = _flatten(baseline["metrics"]), _flatten(result["metrics"])
+    lines = [f"Compared with {baseline.get('commit') or '?'} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(baseline['time']))})"]
+    for name, value in new.items():
+        before = old.get(name)
+        if not before:
+            lines.append(f"   {name:<36}{value:>12g}")
+            continue
+        change = (value - before) / before
+        # throughput: higher is better; times, sizes and failures: lower is better
+        worse = change < -THRESHOLD if name.endswith("_per_s") else change > THRESHOLD
+        lines.append(f"{'⚠️ ' if worse else '   '}{name:<36}{before:>12g} → {value:<12g}{change:+.1%}")
+    return lines
+
+
+def run(quick=False, latency=0.02, levels=(1, 4, 8), items=None):
+    """Run all benchmarks in a temporary cache folder against the stand-in; returns the result entry."""
+    from benchmarks.standin import StandIn
+
+    repeat = 3 if quick else 10
+    items = items or (8 if quick else 24)
+    work_dir = tempfile.mkdtemp(prefix="emico-bench-")
+    with StandIn(latency) as standin:
+        # set before the cache and transport modules are imported; spawned render workers inherit it
+        os.environ["EMICO_CACHE_DIR"] = str(Path(work_dir) / "cache")
+        os.environ["EMICO_HOST_OVERRIDES"] = standin.overrides_env()
+        import http_client
+        # the stand-in is not rate limited, and pacing would be measured instead of our code
+        http_client.configure(HOST_OVERRIDES=standin.overrides(), RATE_LIMIT=False)
+        out_dir = Path(work_dir) / "pdf"
+        out_dir.mkdir()
+        try:
+            metrics = {}
+            print("⏳ Parse ...")
+            metrics["parse"] = bench_parse(repeat)
+            print("⏳ Render ...")
+            metrics["render"] = bench_render(repeat, out_dir)
+            print("⏳ End to end ...")
+            metrics["end_to_end"] = bench_end_to_end(repeat, out_dir)
+            print("⏳ Batch ...")
+            metrics["batch"] = bench_batch(items, levels, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "time": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {"quick": quick, "latency": latency, "levels": list(levels), "items": items},
+        "metrics": metrics,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks and compare with earlier runs")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions and batch items")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in delay per request in seconds")
+    parser.add_argument("--levels", default="1,4,8", help="batch concurrency levels")
+    parser.add_argument("--items", type=int, help="part numbers per batch run")
+    parser.add_argument("--results", default=str(RESULTS_FILE), help="results file (JSON lines)")
+    parser.add_argument("--compare", metavar="COMMIT", help="compare with the last run of this commit")
+    parser.add_argument("--no-save", action="store_true", help="do not store this run")
+    args = parser.parse_args()
+
+    previous = load_results(args.results)
+    result = run(args.quick, args.latency, tuple(int(level) for level in args.levels.split(",")), args.items)
+    print(json.dumps(result["metrics"], indent=2))
+
+    # only runs with the same settings are comparable
+    candidates = [entry for entry in previous if entry.get("config") == result["config"]]
+    if args.compare:
+        candidates = [entry for entry in candidates if entry.get("commit") == args.compare]
+    if candidates:
+        print("\n".join(compare(candidates[-1], result)))
+    elif args.compare:
+        print(f"⚠️ No stored run of {args.compare} with the same settings", file=sys.stderr)
+
+    if not args.no_save:
+        save_result(result, args.results)
+        print(f"✅ Result saved to {args.results}")
@@ -0,0 +1,162 @@
+"""Local stand-in for www.emico.com and intellishop.sirv.com.
+
+Product pages are served from the saved fixtures, with the part number in
+the URL (``/de-DE/emico/<slug>-<part number>``) written into the page and
+its image links, so every part number gets its own page and image URLs.
+Images are synthesized once per kind (photos as noisy JPEGs, drawings
+``_zg`` as line-art PNGs) and tagged with their file name, so the bytes of
+every image differ like on sirv.com and no cache can share them across
+products. Every response waits ``latency`` seconds first.
+"""
+import functools
+import hashlib
+import io
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_PART_NUMBER = "300012056"
+SITES = ("https://www.emico.com", "https://intellishop.sirv.com")
+
+_PAGE_RE = re.compile(r"^/([a-z]{2})-DE/emico/.*?-?(\d+)/?$")
+_IMAGE_RE = re.compile(r"^/emico/[\w-]+\.(jpg|png)$")
+
+
+@functools.lru_cache(maxsize=None)
+def fixture_page(lang):
+    return (FIXTURE_DIR / f"product_{lang}.html").read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _image_of_kind(kind, seed):
+    from PIL import Image, ImageDraw
+
+    buffer = io.BytesIO()
+    if kind == "drawing":
+        image = Image.new("L", (3000, 1500), 255)
+        draw = ImageDraw.Draw(image)
+        for i in range(0, 3000, 150):
+            draw.line((i, 100, 3000 - i, 1400), fill=0, width=4)
+            draw.ellipse((i, 600, i + 120, 720), outline=0, width=3)
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        size = (2400, 1800)
+        gradient = Image.linear_gradient("L").resize(size)
+        noise = Image.effect_noise(size, 4 + seed % 4)
+        image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+        image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _tagged(data, name):
+    """Embed ``name`` as a JPEG comment or PNG text chunk, leaving the pixels alone."""
+    text = name.encode("ascii")
+    if data.startswith(b"\x89PNG"):
+        chunk = b"tEXt" + b"Title\x00" + text
+        # after the 8-byte signature and the 25-byte IHDR chunk
+        return data[:33] + struct.pack(">I", len(chunk) - 4) + chunk + struct.pack(">I", zlib.crc32(chunk)) + data[33:]
+    return data[:2] + b"\xff\xfe" + struct.pack(">H", len(text) + 2) + text + data[2:]
+
+
+def image_bytes(name):
+    """Return the synthetic image for a sirv file name like ``300012056_1.jpg``."""
+    index = name.rsplit("_", 1)[-1].split(".")[0]
+    kind = "drawing" if index == "zg" else "photo"
+    seed = int(hashlib.sha1(index.encode("utf-8")).hexdigest()[:6], 16)
+    return _tagged(_image_of_kind(kind, seed), name)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        path = self.path.split("?", 1)[0]
+        with server.lock:
+            server.hits += 1
+
+        page = _PAGE_RE.match(path)
+        if page and (FIXTURE_DIR / f"product_{page.group(1)}.html").exists():
+            html = fixture_page(page.group(1)).replace(FIXTURE_PART_NUMBER, page.group(2))
+            return self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+        if _IMAGE_RE.match(path):
+            content_type = "image/png" if path.endswith(".png") else "image/jpeg"
+            return self._send(200, image_bytes(path.rsplit("/", 1)[-1]), content_type)
+        self._send(404, b"", "text/plain")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandIn:
+    """The stand-in server on a free local port; use as a context manager."""
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hits(self):
+        return self.server.hits
+
+    def overrides(self):
+        """Return the ``http_client.HOST_OVERRIDES`` sending both sites to this server."""
+        return {site: self.url for site in SITES}
+
+    def overrides_env(self):
+        """Return the overrides as an ``EMICO_HOST_OVERRIDES`` value."""
+        return ",".join(f"{site}={url}" for site, url in self.overrides().items())
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixtures as emico.com and sirv.com")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before each response")
+    args = parser.parse_args()
+
+    standin = StandIn(args.latency, port=args.port)
+    print(f"🔹 Stand-in running on {standin.url}")
+    print(f"   EMICO_HOST_OVERRIDES={standin.overrides_env()}")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,617 @@
+"""Emico datasheet layout, built once per process and reused for every product."""
+import datetime
+import hashlib
+import io
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    TableStyle,
+    CondPageBreak,
+    Flowable,
+    PageBreakIfNotEmpty,
+)
+from reportlab.platypus.doctemplate import ActionFlowable
+
+import image_cache
+import pdf_images
+import timing
+from utils import LANGUAGES
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+CONTENT_WIDTH = PAGE_WIDTH - 5 * cm
+
+# === Filename suffix ===
+FILENAME_LABELS = {
+    "de": "Datenblatt_de",
+    "en": "Productsheet_en",
+    "fr": "FicheDeDonnées_fr",
+    "es": "FichaDeDatos_es",
+    "it": "SchedaDati_it"
+}
+
+# === Multilingual Labels ===
+DATASHEET_LABELS = {
+    "de": "DATENBLATT",
+    "en": "DATASHEET",
+    "fr": "FICHE TECHNIQUE",
+    "es": "HOJA TÉCNICA",
+    "it": "SCHEDA TECNICA"
+}
+
+PAGE_LABELS = {
+    "de": ("Seite", "von"),
+    "en": ("Page", "of"),
+    "fr": ("Page", "sur"),
+    "es": ("Página", "de"),
+    "it": ("Pagina", "di"),
+}
+
+ARTIKEL_LABELS = {
+    "de": "Artikelnummer",
+    "en": "Article Number",
+    "fr": "Numéro d’article",
+    "es": "Número de artículo",
+    "it": "Numero articolo"
+}
+
+TECH_LABELS = {
+    "de": "Technische Daten",
+    "en": "Technical Data",
+    "fr": "Données techniques",
+    "es": "Datos técnicos",
+    "it": "Dati tecnici"
+}
+
+TABLE_HEADERS = {
+    "de": ("Attribut", "Wert"),
+    "en": ("Attribute", "Value"),
+    "fr": ("Attribut", "Valeur"),
+    "es": ("Atributo", "Valor"),
+    "it": ("Attributo", "Valore"),
+}
+
+DESC_LABELS = {
+    "de": "Beschreibung",
+    "en": "Description",
+    "fr": "Description",
+    "es": "Descripción",
+    "it": "Descrizione"
+}
+
+DRAWING_LABELS = {
+    "de": "Zeichnung und Maßtabelle",
+    "en": "Drawing and Dimension Table",
+    "fr": "Dessin et tableau des dimensions",
+    "es": "Dibujo y tabla de dimensiones",
+    "it": "Disegno e tabella delle dimensioni"
+}
+
+# === Footer company lines (NO website) ===
+COMPANY_TEXTS = {
+    "de": "syskomp gehmeyr GmbH – emico • Max-Planck-Straße 1 • 92224 Amberg • Tel.: +49 9621 67545-0 • sales@emico.com",
+    "en": "syskomp gehmeyr GmbH – emico • Max-Planck-Straße 1 • 92224 Amberg • Phone: +49 9621 67545-0 • sales@emico.com",
+    "fr": "syskomp gehmeyr GmbH – emico • Max-Planck-Straße 1 • 92224 Amberg • Tél.: +49 9621 67545-0 • sales@emico.com",
+    "es": "syskomp gehmeyr GmbH – emico • Max-Planck-Straße 1 • 92224 Amberg • Tel.: +49 9621 67545-0 • sales@emico.com",
+    "it": "syskomp gehmeyr GmbH – emico • Via Gerolamo Fracastoro 3 • 37010 Cavaion Veronese • Tel.: +39 045 7235605 • info@emico.it"
+}
+
+# === QR code and text ===
+QR_ASSETS = {
+    "de": "assets/emico_qr.png",
+    "en": "assets/emico_qr_en.png",
+    "fr": "assets/emico_qr_fr.png",
+    "es": "assets/emico_qr_es.png",
+    "it": "assets/emico_qr_it.png",
+}
+
+QR_TEXTS = {
+    "de": (
+        "Scannen Sie den QR-Code, um weitere Artikel in dieser Kategorie zu entdecken.<br/><br/>"
+        "Für eine individuelle Beratung freuen wir uns über Ihre E-Mail an "
+        "<a href='mailto:sales@emico.com'>sales@emico.com</a> oder telefonisch unter +49 9621 67545-0."
+    ),
+    "en": (
+        "Scan the QR code to discover more items in this category.<br/><br/>"
+        "For personalized advice, feel free to contact us at "
+        "<a href='mailto:sales@emico.com'>sales@emico.com</a> or by phone at +49 9621 67545-0."
+    ),
+    "fr": (
+        "Scannez le code QR pour découvrir d'autres articles dans cette catégorie.<br/><br/>"
+        "Pour un conseil personnalisé, contactez-nous par e-mail à "
+        "<a href='mailto:sales@emico.com'>sales@emico.com</a> ou par téléphone au +49 9621 67545-0."
+    ),
+    "es": (
+        "Escanee el código QR para descubrir más artículos en esta categoría.<br/><br/>"
+        "Para recibir asesoramiento personalizado, puede escribirnos a "
+        "<a href='mailto:sales@emico.com'>sales@emico.com</a> o llamarnos al +49 9621 67545-0."
+    ),
+    "it": (
+        "Scansiona il codice QR per scoprire altri articoli in questa categoria.<br/><br/>"
+        "Per una consulenza personalizzata, contattaci via e-mail a "
+        "<a href='mailto:info@emico.it'>info@emico.it</a> oppure telefonicamente al +39 045 7235605."
+    )
+}
+
+DISCLAIMER_TEXTS = {
+    "de": "Die Angaben in diesem Dokument erfolgen nach bestem Wissen, jedoch ohne Gewähr. Änderungen und Irrtümer sind vorbehalten.",
+    "en": "The information in this document is provided to the best of our knowledge, but without guarantee. Changes and errors reserved.",
+    "fr": "Les informations contenues dans ce document sont fournies au mieux de nos connaissances, mais sans garantie.",
+    "es": "La información de este documento se proporciona según nuestro leal saber y entender, pero sin garantía.",
+    "it": "Le informazioni contenute in questo documento sono fornite al meglio delle nostre conoscenze, ma senza garanzia."
+}
+
+_ZG_RE = re.compile(r"_zg.*\.(jpg|png)$", re.I)
+_PRODUCT_IMAGE_EXCLUDE_RE = re.compile(r"_zg(?:_\d+)?\.(jpg|png)$", re.I)
+
+# bump when a layout change should re-render datasheets whose data did not change
+TEMPLATE_VERSION = 1
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def current_version():
+    """Return the version stamp printed on datasheets rendered now."""
+    return datetime.datetime.now().strftime("%m/%Y")
+
+
+def image_links(clean_links):
+    """Return ``(product_image_links, drawing_links)``: the images a datasheet actually prints."""
+    img_links = [l for l in clean_links if not _PRODUCT_IMAGE_EXCLUDE_RE.search(l)][:3]
+    zg_links = [l for l in clean_links if _ZG_RE.search(l)][:1]
+    return img_links, zg_links
+
+
+# === Clean product name helper ===
+def clean_product_name(name: str) -> str:
+    if not name:
+        return ""
+    name = re.sub(r"\([^)]*\)", "", name)
+    name = re.sub(r"\b\d+\s*[xX]\s*\d+\b", "", name)
+    name = re.sub(r"\b\d+\s*(mm|cm|inch|in)\b", "", name, flags=re.I)
+    name = re.sub(r"\b\d+\b", "", name)
+    name = re.sub(r"[^\w\s]", " ", name)
+    name = re.sub(r"\s+", " ", name)
+    return name.strip()
+
+
+def _labels_for(lang):
+    return {
+        "filename": FILENAME_LABELS[lang],
+        "datasheet": DATASHEET_LABELS[lang],
+        "page": PAGE_LABELS[lang],
+        "artikel": ARTIKEL_LABELS[lang],
+        "tech": TECH_LABELS[lang],
+        "table_headers": TABLE_HEADERS[lang],
+        "desc": DESC_LABELS[lang],
+        "drawing": DRAWING_LABELS[lang],
+        "company": COMPANY_TEXTS[lang],
+        "qr": QR_TEXTS[lang],
+        "disclaimer": DISCLAIMER_TEXTS[lang],
+    }
+
+
+class DatasheetTemplate:
+    """Styles, label tables and assets of the datasheet layout; ``render`` builds one PDF."""
+
+    def __init__(self):
+        # === Styles ===
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(name="CustomTitle",
+                                  fontSize=20,
+                                  leading=22,
+                                  alignment=1,
+                                  fontName="Helvetica-Bold"))
+        styles.add(ParagraphStyle(name="CustomHeading",
+                                  fontSize=14,
+                                  leading=18,
+                                  spaceBefore=12,
+                                  spaceAfter=6,
+                                  fontName="Helvetica-Bold"))
+        styles.add(ParagraphStyle(name="CustomBodyText",
+                                  fontSize=11,
+                                  leading=14,
+                                  alignment=4))
+        styles.add(ParagraphStyle("ArtikelnummerCentered", parent=styles["CustomBodyText"], alignment=1))
+        styles.add(ParagraphStyle("FooterHeader",
+                                  fontName="Helvetica",
+                                  fontSize=7,
+                                  alignment=1,
+                                  textColor=colors.Color(0.2, 0.2, 0.2)))
+        styles.add(ParagraphStyle("FooterCompany",
+                                  fontName="Helvetica",
+                                  fontSize=7,
+                                  alignment=1,
+                                  textColor=colors.Color(0.2, 0.2, 0.2)))
+        styles.add(ParagraphStyle("Disc", fontName="Helvetica-Oblique",
+                                  fontSize=7.5, alignment=1, textColor=colors.darkgrey))
+        self.styles = styles
+
+        # === Table styles ===
+        self.image_table_style = TableStyle([
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("RIGHTPADDING", (0, 0), (-2, 0), 30),
+        ])
+        self.spec_table_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ])
+        self.qr_text_box_style = TableStyle([
+            ("BOX", (0, 0), (-1, -1), 0.25, colors.black),
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 4),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+        ])
+        self.qr_table_style = TableStyle([("VALIGN", (0, 0), (-1, -1), "MIDDLE")])
+
+        # === Labels and assets ===
+        self.labels = {lang: _labels_for(lang) for lang in LANGUAGES}
+        self.logo = pdf_images.asset_image("assets/emicologo.png", 6.4 * cm, 2.6 * cm)
+        self.qr_images = {lang: pdf_images.asset_image(path) for lang, path in QR_ASSETS.items()}
+
+    def labels_for(self, lang):
+        return self.labels.get(lang, self.labels["de"])
+
+    def output_filename(self, basic_info, lang, save_folder):
+        return os.path.join(
+            save_folder,
+            f"{basic_info.get('artikelnummer', 'emico_product')}_{self.labels_for(lang)['filename']}.pdf"
+        )
+
+    # =====================================================================
+    # FOOTER WITH CENTERED DIVIDER LINE + FONT SIZE 7
+    # =====================================================================
+    def draw_header_footer(self, canvas_obj, doc_obj, labels, product_name, version_str):
+        # logo, footer text and divider are identical on every page: lay them out once
+        # per document as a form XObject and only reference it on the following pages
+        form_name = "emico-footer-" + hashlib.sha1(
+            f"{labels['datasheet']}|{product_name}|{version_str}|{labels['company']}".encode("utf-8")
+        ).hexdigest()
+        if not canvas_obj.hasForm(form_name):
+            canvas_obj.beginForm(form_name)
+            self._draw_static_footer(canvas_obj, labels, product_name, version_str)
+            canvas_obj.endForm()
+        canvas_obj.doForm(form_name)
+
+        # --- PAGE NUMBER (the total is filled in by NumberedCanvas.save)
+        canvas_obj.draw_page_number(PAGE_WIDTH - 2.5 * cm, 0.55 * cm, labels["page"])
+
+    def _draw_static_footer(self, canvas_obj, labels, product_name, version_str):
+        # Logo (one shared XObject per document)
+        if self.logo:
+            canvas_obj.drawImage(
+                self.logo,
+                (PAGE_WIDTH - 6.4 * cm) / 2,
+                PAGE_HEIGHT - 3 * cm,
+                6.4 * cm,
+                2.6 * cm,
+                preserveAspectRatio=True,
+                mask="auto",
+            )
+
+        # --- Footer Header (DATENBLATT | Product | Version)
+        header_text = (
+            f"{labels['datasheet']} | {product_name} | "
+            f"Version <font color='#000000'><b>{version_str}</b></font>"
+        )
+        p_header = Paragraph(header_text, self.styles["FooterHeader"])
+        p_header.wrap(CONTENT_WIDTH, 20)
+        p_header.drawOn(canvas_obj, 2.5 * cm, 1.45 * cm)
+
+        # --- COMPANY FOOTER LINE (centered)
+        p_company = Paragraph(labels["company"], self.styles["FooterCompany"])
+        p_company.wrap(CONTENT_WIDTH, 20)
+        p_company.drawOn(canvas_obj, 2.5 * cm, 0.9 * cm)
+
+        # --- DIVIDER LINE (solid black, centered)
+        canvas_obj.setStrokeColor(colors.Color(0.2, 0.2, 0.2))
+        canvas_obj.setLineWidth(1)
+        canvas_obj.line(2.5 * cm, 1.45 * cm, PAGE_WIDTH - 2.5 * cm, 1.45 * cm)
+
+    def _spec_table(self, labels, specs):
+        attr_label, value_label = labels["table_headers"]
+        data = [[attr_label, value_label]] + [[k, v] for k, v in specs.items()]
+        table = Table(data,
+                      colWidths=[CONTENT_WIDTH / 2] * 2,
+                      hAlign="CENTER")
+        table.setStyle(self.spec_table_style)
+        return table
+
+    def render(self, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang, save_folder=None,
+               version=None):
+        """Build the datasheet of one product into ``save_folder`` and return the file path."""
+        output_filename = self.output_filename(basic_info, lang, save_folder)
+        self.write(output_filename, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang, version)
+        return output_filename
+
+    def render_bytes(self, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang, version=None):
+        """Build the datasheet of one product in memory and return the PDF bytes."""
+        buffer = io.BytesIO()
+        self.write(buffer, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang, version)
+        return buffer.getvalue()
+
+    def write(self, target, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang, version=None):
+        """Build the datasheet of one product into ``target``, a filename or a writable binary stream.
+
+        ``version`` is the footer's version stamp ("MM/YYYY"); None stamps the current month.
+        """
+        # files are written in one go after the layout, so a slow network share shows up as its own stage
+        to_file = isinstance(target, (str, os.PathLike))
+        buffer = io.BytesIO() if to_file else target
+        doc = self._doc(buffer)
+        doc.footer = self._footer(basic_info, lang, version)
+        with timing.stage("story"):
+            story = self._story(basic_info, base_specs, technical_specs, drawing_data, clean_links, lang)
+        with timing.stage("layout"):
+            doc.build(story, canvasmaker=NumberedCanvas)
+        if to_file:
+            with timing.stage("write", bytes=buffer.tell()):
+                with open(target, "wb") as f:
+                    f.write(buffer.getbuffer())
+
+    def write_catalog(self, target, records):
+        """Build one catalog PDF of many products into ``target``; returns ``(record, error)`` of skipped ones.
+
+        ``records`` (tuples as returned by ``get_emico_data``) is consumed
+        lazily: each product's story is built when the previous one has been
+        laid out, so only one product's flowables and images are held at a
+        time. Every product starts on a new page and gets an outline entry
+        under its article number; logo, QR codes and repeated images are
+        embedded once for the whole catalog.
+        """
+        skipped = []
+
+        def stories():
+            for index, record in enumerate(records):
+                basic_info, lang = record[0], record[5]
+                try:
+                    story = self._story(*record)
+                except Exception as e:
+                    skipped.append((record, e))
+                    continue
+                artikelnummer = basic_info.get("artikelnummer", "–")
+                title = f"{artikelnummer} {clean_product_name(basic_info.get('product_name', ''))}".strip()
+                yield [
+                    PageBreakIfNotEmpty(),
+                    _StartProduct(self._footer(basic_info, lang)),
+                    _Bookmark(f"emico-product-{index}", title),
+                    *story,
+                ]
+
+        doc = self._doc(target)
+        doc.build(_StoryStream(stories()), canvasmaker=NumberedCanvas)
+        return skipped
+
+    def _doc(self, target):
+        return _DatasheetDocTemplate(
+            target,
+            self,
+            pagesize=A4,
+            rightMargin=2.5 * cm,
+            leftMargin=2.5 * cm,
+            topMargin=3 * cm,
+            bottomMargin=2 * cm,
+        )
+
+    def _footer(self, basic_info, lang, version=None):
+        product_name = clean_product_name(basic_info.get("product_name", ""))
+        version_str = version or current_version()
+        return self.labels_for(lang), product_name, version_str
+
+    def _story(self, basic_info, base_specs, technical_specs, drawing_data, clean_links, lang):
+        """Return the flowables of one product's datasheet."""
+        styles = self.styles
+        labels = self.labels_for(lang)
+
+        # === Images: download and resample all of them in parallel while the story is built ===
+        @timing.bind
+        def make_resized_image(url, max_width, max_height):
+            try:
+                with timing.stage("image_fetch", images=1) as stage:
+                    content = image_cache.get_image(url)
+                    stage["bytes"] = len(content)
+                # resampled to the printed size, so only the pixels we print get embedded
+                return pdf_images.product_image(content, max_width, max_height)
+            except Exception:
+                return None
+
+        img_links, zg_links = image_links(clean_links)
+
+        image_pool = ThreadPoolExecutor(max_workers=4)
+        product_images = []
+        if img_links:
+            target_width = CONTENT_WIDTH / len(img_links) - 1 * cm
+            product_images = [image_pool.submit(make_resized_image, l, target_width, PAGE_HEIGHT / 6) for l in img_links]
+        drawing_image = None
+        if zg_links:
+            drawing_image = image_pool.submit(make_resized_image, zg_links[0], CONTENT_WIDTH, PAGE_HEIGHT / 5)
+        image_pool.shutdown(wait=False)
+
+        story = []
+
+        # === Title ===
+        story.append(Paragraph(f"<b>{basic_info.get('product_name', 'Produktname unbekannt')}</b>", styles["CustomTitle"]))
+        story.append(Spacer(1, 4))
+
+        story.append(
+            Paragraph(
+                f"{labels['artikel']}: {basic_info.get('artikelnummer', '–')}",
+                styles["ArtikelnummerCentered"],
+            )
+        )
+        story.append(Spacer(1, 10))
+
+        # === Images ===
+        if product_images:
+            imgs = [f.result() for f in product_images]
+
+            table = Table([imgs], hAlign="CENTER")
+            table.setStyle(self.image_table_style)
+            story.append(table)
+            story.append(Spacer(1, 12))
+
+        # === Technical Data ===
+        technische_daten = {**base_specs, **technical_specs}
+
+        if technische_daten:
+            story.append(Paragraph(f"<b>{labels['tech']}</b>", styles["CustomHeading"]))
+            story.append(self._spec_table(labels, technische_daten))
+            story.append(Spacer(1, 12))
+
+        # === Description ===
+        beschreibung = basic_info.get("beschreibung", "").strip()
+        if beschreibung and beschreibung != "<p></p>":
+            beschreibung = beschreibung.replace("<br>", "<br/>").replace("<p>", "").replace("</p>", "")
+            story.append(Paragraph(f"<b>{labels['desc']}</b>", styles["CustomHeading"]))
+            story.append(Paragraph(beschreibung, styles["CustomBodyText"]))
+            story.append(Spacer(1, 10))
+
+        story.append(CondPageBreak(PAGE_HEIGHT / 2))
+
+        # === Drawing ===
+        story.append(Paragraph(f"<b>{labels['drawing']}</b>", styles["CustomHeading"]))
+
+        if drawing_image:
+            zg_img = drawing_image.result()
+            if zg_img:
+                story.append(zg_img)
+                story.append(Spacer(1, 12))
+
+        if drawing_data:
+            story.append(self._spec_table(labels, drawing_data))
+            story.append(Spacer(1, 12))
+
+        # === QR Code ===
+        qr_source = self.qr_images.get(lang, self.qr_images["de"])
+        if qr_source:
+            story.append(Spacer(1, 8))
+            qr_img = pdf_images.SharedImageFlowable(qr_source, 3.5 * cm, 3.5 * cm, hAlign="LEFT")
+
+            qr_para = Paragraph(labels["qr"], styles["CustomBodyText"])
+
+            qr_text_box = Table([[qr_para]],
+                                colWidths=[CONTENT_WIDTH - 4 * cm],
+                                hAlign="LEFT")
+            qr_text_box.setStyle(self.qr_text_box_style)
+
+            qr_table = Table([[qr_img, qr_text_box]],
+                             colWidths=[4 * cm, CONTENT_WIDTH - 4 * cm],
+                             hAlign="CENTER")
+            qr_table.setStyle(self.qr_table_style)
+
+            story.append(qr_table)
+            story.append(Spacer(1, 2))
+
+        story.append(Paragraph(labels["disclaimer"], styles["Disc"]))
+        return story
+
+
+class _DatasheetDocTemplate(SimpleDocTemplate):
+    """Draws the header and footer of the product a page belongs to when the page is finished."""
+
+    def __init__(self, target, template, **kwargs):
+        SimpleDocTemplate.__init__(self, target, **kwargs)
+        self.template = template
+        self.footer = None
+
+    def afterPage(self):
+        if self.footer:
+            self.template.draw_header_footer(self.canv, self, *self.footer)
+
+
+class _StartProduct(ActionFlowable):
+    """Switches the footer to the next product of a catalog."""
+
+    def __init__(self, footer):
+        ActionFlowable.__init__(self)
+        self.footer = footer
+
+    def apply(self, doc):
+        doc.footer = self.footer
+
+
+class _Bookmark(Flowable):
+    """Zero-size flowable adding an outline entry for the page it lands on."""
+
+    def __init__(self, key, title):
+        Flowable.__init__(self)
+        self.key = key
+        self.title = title
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+        self.canv.showOutline()
+
+
+class _StoryStream(list):
+    """Flowable list for ``doc.build`` that pulls the next story once it has been laid out."""
+
+    def __init__(self, stories):
+        list.__init__(self)
+        self._stories = iter(stories)
+
+    def __len__(self):
+        # build() checks len() before taking each flowable
+        while not list.__len__(self):
+            story = next(self._stories, None)
+            if story is None:
+                return 0
+            self.extend(story)
+        return list.__len__(self)
+
+
+class NumberedCanvas(Canvas):
+    """Canvas that writes "Page X of Y" once the page total is known.
+
+    Each page references a form XObject for its page number and the forms
+    are only defined in ``save``, so the story is laid out a single time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        Canvas.__init__(self, *args, **kwargs)
+        self._page_numbers = []
+
+    def draw_page_number(self, x, y, page_labels):
+        name = f"emico-page-number-{len(self._page_numbers)}"
+        self._page_numbers.append((name, self.getPageNumber(), x, y, page_labels))
+        self.doForm(name)
+
+    def save(self):
+        if len(self._code):
+            self.showPage()
+        total = self.getPageNumber() - 1
+        for name, page_num, x, y, (label_page, label_of) in self._page_numbers:
+            self.beginForm(name)
+            self.setFont("Helvetica", 7)
+            self.drawRightString(x, y, f"{label_page} {page_num} {label_of} {total}")
+            self.endForm()
+        Canvas.save(self)
+
+
+def get_template():
+    """Return the process-wide ``DatasheetTemplate``, building it on first use."""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = DatasheetTemplate()
+    return _template
@@ -0,0 +1,64 @@
+"""Size limit for a cache folder on disk, evicting the least recently used files first."""
+import os
+import threading
+
+
+class DiskBudget:
+    """Keep the files under ``folder`` (matching ``pattern``) below ``limit`` bytes.
+
+    Readers mark a file as used with ``touch``; when ``added`` pushes the
+    total over the limit, the least recently used files are deleted until it
+    is back at 90 % of it. The total is scanned once and then kept up to date.
+    """
+
+    def __init__(self, folder, limit, pattern="*/*"):
+        self.folder = folder
+        self.limit = limit
+        self.pattern = pattern
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _scan(self):
+        return sum(p.stat().st_size for p in self.folder.glob(self.pattern)) if self.folder.exists() else 0
+
+    def added(self, size):
+        """Count a file of ``size`` bytes just written to the folder, evicting others if it is over the limit."""
+        with self._lock:
+            if self._size is None:
+                # the scan already finds the new file
+                self._size = self._scan()
+            else:
+                self._size += size
+            over_limit = self._size > self.limit
+        if over_limit:
+            self.evict()
+
+    @staticmethod
+    def touch(path):
+        """Mark ``path`` as recently used."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Delete least recently used files until the folder fits 90 % of ``limit``."""
+        entries = []
+        for path in self.folder.glob(self.pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.limit * 0.9:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._size = total
@@ -0,0 +1,41 @@
+"""Row-by-row reading of the Excel import lists.
+
+openpyxl's read-only mode parses the sheet XML lazily, so only the current
+row is in memory and the first part number is available before the rest of
+the sheet has been read.
+"""
+from part_index import normalize_part_number
+
+IMPORT_FILE = "Importvorlage_aktuell.xlsx"
+IMPORT_SHEET = "neue Teilenummern"
+PART_NUMBER_COLUMN = "TeileNr"
+
+
+def iter_columns(path, sheet_name, columns):
+    """Yield a tuple with the values of ``columns`` (header names in the first row) for every row."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = [str(name).strip() if name is not None else "" for name in next(rows, ())]
+        missing = [name for name in columns if name not in header]
+        if missing:
+            raise ValueError(f"Sheet '{sheet_name}' in {path} has no column(s): {', '.join(missing)}")
+        positions = [header.index(name) for name in columns]
+        for row in rows:
+            yield tuple(row[i] if i < len(row) else None for i in positions)
+    finally:
+        workbook.close()
+
+
+def iter_part_numbers(path=IMPORT_FILE, sheet_name=IMPORT_SHEET, column=PART_NUMBER_COLUMN, unique=True):
+    """Yield the normalized part numbers of an import list, skipping empty cells (and repeats if ``unique``)."""
+    seen = set()
+    for (value,) in iter_columns(path, sheet_name, (column,)):
+        part_number = normalize_part_number(value)
+        if not part_number or part_number in seen:
+            continue
+        if unique:
+            seen.add(part_number)
+        yield part_number
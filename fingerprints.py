@@ -0,0 +1,96 @@
+"""Fingerprints of rendered datasheets, so unchanged products are not rendered again.
+
+A fingerprint hashes everything a datasheet is made of: the scraped
+``basic_info`` and spec dicts, the image contents and the template version.
+The fingerprints live in ``emico_fingerprints.sqlite`` next to the PDFs,
+together with the version stamp printed in the footer.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+from utils import sqlite_journal_mode
+
+STORE_NAME = "emico_fingerprints.sqlite"
+PARTS = ("basic_info", "base_specs", "technical_specs", "drawing_data", "images", "template")
+# changes of these parts alone keep the version stamp of the datasheet
+LAYOUT_PARTS = ("template",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    part_number TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    parts TEXT NOT NULL,
+    version TEXT,
+    output TEXT,
+    updated REAL,
+    PRIMARY KEY (part_number, lang)
+)
+"""
+
+
+def _digest(value):
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def compute(record, image_digests):
+    """Return ``(fingerprint, parts)`` of a scraped record; ``image_digests`` maps image URL -> content hash."""
+    from datasheet_template import TEMPLATE_VERSION
+
+    basic_info, base_specs, technical_specs, drawing_data, _, lang = record
+    parts = {
+        "basic_info": _digest(basic_info),
+        "base_specs": _digest(base_specs),
+        "technical_specs": _digest(technical_specs),
+        "drawing_data": _digest(drawing_data),
+        "images": _digest(image_digests),
+        "template": _digest([TEMPLATE_VERSION, lang]),
+    }
+    return _digest(parts), parts
+
+
+def changed_parts(parts, previous_parts):
+    """Return the names of the parts that differ from ``previous_parts``."""
+    return [name for name in PARTS if parts.get(name) != previous_parts.get(name)]
+
+
+class FingerprintStore:
+    """Last rendered fingerprint, version stamp and output file per ``(part_number, lang)``."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(f"PRAGMA journal_mode={sqlite_journal_mode(self.path)}")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def get(self, part_number, lang):
+        row = self._db.execute(
+            "SELECT * FROM fingerprints WHERE part_number = ? AND lang = ?", (part_number, lang)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["parts"] = json.loads(entry["parts"])
+        return entry
+
+    def put(self, part_number, lang, fingerprint, parts, version, output):
+        self._db.execute(
+            "INSERT OR REPLACE INTO fingerprints (part_number, lang, fingerprint, parts, version, output, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (part_number, lang, fingerprint, json.dumps(parts), version, output, time.time()),
+        )
+        self._db.commit()
@@ -1,23 +1,343 @@
-import pandas as pd
-import requests
-import re
+import collections
+import contextlib
+import hashlib
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import excel_ingest
+import fingerprints
+import http_client
+import part_index
+from job_journal import JobJournal
+from snapshot_store import SnapshotStore, STORE_NAME as SNAPSHOT_NAME
+from utils import cache_dir, submit_bounded, write_atomic
 sprache = 'de'
-file = pd.ExcelFile("Importvorlage_aktuell.xlsx")
-link_file = pd.ExcelFile("Mappe1.xlsx")
-article_df = pd.read_excel(file, sheet_name = "neue Teilenummern")
-link_df = pd.read_excel(link_file, sheet_name='url')
-artikels = article_df['TeileNr']
-
-def generate_all(artikels):
-    for number in artikels[:5]:
-        match = link_df.loc[link_df['Spalte1'] == str(number).strip(),'loc']
-        print(number, match.iloc[0],type(match.iloc[0]))
-        # If a row is found
-        if match.empty:
-            # Example: get a specific column, e.g. 'loc
+IMPORT_FILE = excel_ingest.IMPORT_FILE
+LINK_FILE = part_index.LINK_FILE
+DEFAULT_OUTPUT = Path(os.environ.get("EMICO_PDF_OUTPUT") or r"G:\6Artikel\Datenblätter(Produkte)")
+
+
+def load_artikels(import_file=IMPORT_FILE):
+    # streamed: the first part numbers are available while the sheet is still being read
+    return excel_ingest.iter_part_numbers(import_file)
+
+
+def product_urls(artikels, link_file=LINK_FILE, lang=sprache):
+    """Yield ``(part_number, url)`` lazily; ``url`` is None if the part number is not in the link workbook."""
+    index = part_index.load_index(link_file)
+    for number in artikels:
+        yield number, index.lookup(number, lang)
+
+
+def generate_all(artikels, link_file=LINK_FILE, limit=5):
+    for number, url in itertools.islice(product_urls(artikels, link_file), limit):
+        if url is None:
             print(f"No loc found for {number}")
+            continue
+        print(number, url, type(url))
+
+
+# === Resumable batch run ===
+def _image_digests(record, cache_mode=None):
+    """Download or revalidate (per ``cache_mode``) the images the datasheet prints; returns ``{url: sha256}``.
+
+    An image that cannot be downloaded gets the digest None: the datasheet is
+    rendered without it, and re-rendered once it is back.
+    """
+    import image_cache
+    from datasheet_template import image_links
+
+    img_links, zg_links = image_links(record[4])
+    digests = {}
+    for link in img_links + zg_links:
+        try:
+            digests[link] = hashlib.sha256(image_cache.revalidate(link, cache_mode)).hexdigest()
+        except Exception as e:
+            digests[link] = None
+            print(f"⚠️ {record[0].get('artikelnummer')}: image not available, {link}: {e}")
+    return digests
+
+
+def _resolved_jobs(jobs, journal, lang, link_file):
+    """Look up the URL of pending jobs as they come; yields the jobs that have one."""
+    index = part_index.load_index(link_file)
+    for job in jobs:
+        if job["stage"] == "pending":
+            job["url"] = index.lookup(job["part_number"], lang)
+            if job["url"] is None:
+                journal.fail(job["part_number"], lang, f"LookupError: no {lang} URL in {link_file}")
+                print(f"❌ {job['part_number']}: no URL found")
+                continue
+            journal.advance(job["part_number"], lang, "resolved", url=job["url"])
+            job["stage"] = "resolved"
+        yield job
+
+
+def _fetch_job(url, record, lang, cache_mode):
+    """Scrape a page (unless its record is already known) and download the images the datasheet prints.
+
+    Returns ``(record, scraped, image_digests, error)``; ``scraped`` tells whether the page was scraped now.
+    """
+    from main import get_emico_data
+
+    scraped = record is None
+    try:
+        if scraped:
+            record = get_emico_data(url, cache_mode=cache_mode, lang=lang)
+            # error pages and category pages parse fine but are no product
+            if not record[0].get("artikelnummer"):
+                raise LookupError(f"No product data on {url}")
+    except Exception as e:
+        return None, False, None, e
+    try:
+        image_digests = _image_digests(record, cache_mode)
+    except Exception as e:
+        return record, scraped, None, e
+    return record, scraped, image_digests, None
+
+
+def _fetched_records(jobs, journal, lang, max_workers, cache_mode):
+    """Run the scrape and image stages concurrently; yields ``(job, record, image_digests)`` for jobs that passed both."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def submit(job):
+            # the journal connection belongs to this thread, so stored records are loaded here
+            record = journal.record(job["part_number"], lang) if job["stage"] == "scraped" else None
+            return pool.submit(_fetch_job, job["url"], record, lang, cache_mode)
+
+        for job, future in submit_bounded(jobs, submit, max_workers * 2):
+            record, scraped, image_digests, error = future.result()
+            if scraped:
+                journal.advance(job["part_number"], lang, "scraped", record=record)
+            if error is not None:
+                journal.fail(job["part_number"], lang, f"{type(error).__name__}: {error}")
+                print(f"❌ {job['part_number']}: {error}")
+            else:
+                journal.advance(job["part_number"], lang, "images")
+                yield job, record, image_digests
+
+
+def _ready_records(jobs, journal, lang):
+    """Yield ``(job, record, image_digests)`` for jobs whose record and images are already there."""
+    for job in jobs:
+        record = journal.record(job["part_number"], lang)
+        try:
+            # checked against the server when the job passed the image stage; only needed for the fingerprint
+            image_digests = _image_digests(record, "offline")
+        except Exception as e:
+            journal.fail(job["part_number"], lang, f"{type(e).__name__}: {e}")
+            print(f"❌ {job['part_number']}: {e}")
+            continue
+        yield job, record, image_digests
+
+
+def _archive(path):
+    from archive_export import ZipExporter
+    return ZipExporter(path)
+
+
+def default_journal_path(save_folder):
+    """Return the journal of an output folder, kept locally under ``cache_dir("jobs")``.
+
+    The output folder is usually a network share, where SQLite cannot lock reliably.
+    """
+    folder = os.path.abspath(save_folder)
+    key = hashlib.sha1(folder.encode("utf-8")).hexdigest()[:12]
+    path = cache_dir("jobs") / f"{os.path.basename(folder) or 'output'}-{key}.sqlite"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return str(path)
+
+
+def _output_exists(output, archive):
+    """Tell whether a recorded output is still where this run writes.
+
+    With an archive only its own entries (``<archive>!/<entry>``) count, so
+    PDFs of an earlier run into single files are rendered into the archive.
+    """
+    if archive is not None:
+        prefix = f"{archive.path}!/"
+        return output.startswith(prefix) and output[len(prefix):] in archive
+    return os.path.exists(output)
+
+
+def run_batch(artikels, save_folder, journal_path=None, link_file=LINK_FILE, lang=sprache,
+              retry_failed=True, max_workers=8, render_workers=None, cache_mode=None, new_run=False, force=False,
+              snapshot_path=None, archive_path=None):
+    """Render the datasheets of all part numbers, resuming an earlier run of the same journal.
+
+    Each stage (resolved, scraped, images, rendered, written) is recorded per
+    part number in a SQLite journal, by default a local one per
+    ``save_folder`` (``default_journal_path``). Finished part numbers are skipped; failed ones are
+    retried unless ``retry_failed`` is False. ``new_run`` starts over with
+    every part number, e.g. for the monthly update.
+
+    Unfinished jobs of the journal come first. ``artikels`` is registered in
+    chunks while the run goes on, and each committed chunk goes straight
+    into the pipeline, so the first datasheets do not wait for the whole
+    import list.
+
+    Products whose fingerprint (scraped data, images, template version) is
+    the same as for the existing PDF are not rendered again, unless ``force``.
+    Returns the journal summary plus the number of ``unchanged`` products.
+
+    Scraped records are kept in a snapshot store (``emico_snapshots.jsonl.gz``
+    in ``save_folder`` unless ``snapshot_path``) for rendering them offline.
+
+    With ``archive_path`` the PDFs go into one ZIP archive (``<lang>/<file>``
+    entries) instead of single files; the fingerprints stay in
+    ``save_folder``. A changed datasheet is appended to the archive again
+    (the older copies are dropped when the archive is compacted on close).
+    Archive entries count as written once a checkpoint has put them on disk.
+    """
+    from batch_render import render_batch_bytes
+    from datasheet_template import current_version
+
+    os.makedirs(save_folder, exist_ok=True)
+    journal_path = journal_path or default_journal_path(save_folder)
+    snapshot_path = snapshot_path or os.path.join(save_folder, SNAPSHOT_NAME)
+    with JobJournal(journal_path) as journal, SnapshotStore(snapshot_path) as snapshots, \
+            fingerprints.FingerprintStore(os.path.join(save_folder, fingerprints.STORE_NAME)) as store, \
+            (_archive(archive_path) if archive_path else contextlib.nullcontext()) as archive:
+        if new_run:
+            journal.restart(lang)
+        unfinished = journal.todo(lang, retry_failed)
+        print(f"🔹 {len(unfinished)} unfinished part numbers in the journal")
+        added = 0
+
+        def new_jobs():
+            nonlocal added
+            # the import list is read and registered chunk by chunk, as the pipeline asks for more
+            for jobs in journal.register(artikels, lang):
+                added += len(jobs)
+                yield from jobs
+
+        # === Resolve, scrape + images, then render ===
+        # records of jobs that got past the image stage before come straight from the journal
+        ready = _ready_records((job for job in unfinished if job["stage"] in ("images", "rendered")), journal, lang)
+        fetched = _fetched_records(
+            _resolved_jobs(
+                itertools.chain((job for job in unfinished if job["stage"] in ("pending", "resolved", "scraped")),
+                                new_jobs()),
+                journal, lang, link_file,
+            ),
+            journal, lang, max_workers, cache_mode,
+        )
+        owners = {}
+        changes = collections.Counter()
+
+        def records():
+            for job, record, image_digests in itertools.chain(ready, fetched):
+                # only appended if the data differs from the last snapshot of the product
+                snapshots.add(record, job["url"])
+                # === Fingerprint: skip products whose datasheet would come out the same ===
+                fingerprint, parts = fingerprints.compute(record, image_digests)
+                previous = store.get(job["part_number"], lang)
+                changed = fingerprints.changed_parts(parts, previous["parts"]) if previous else ["new"]
+                if previous and not force and previous["fingerprint"] == fingerprint \
+                        and previous["output"] and _output_exists(previous["output"], archive):
+                    journal.advance(job["part_number"], lang, "written", output=previous["output"])
+                    changes["unchanged"] += 1
+                    continue
+                # nothing changed: rendered because of --force or because the output is gone
+                reasons = changed or ["forced" if force else "missing output"]
+                changes.update(reasons)
+                # the version stamp only moves on when the product itself changed
+                keep_version = previous and set(changed) <= set(fingerprints.LAYOUT_PARTS)
+                job.update(fingerprint=fingerprint, parts=parts, reasons=reasons,
+                           version=previous["version"] if keep_version else current_version())
+                owners[id(record)] = job
+                yield record
+
+        def version_for(record):
+            return owners[id(record)]["version"]
+
+        def written(job, path):
+            journal.advance(job["part_number"], lang, "written", output=path)
+            store.put(job["part_number"], lang, job["fingerprint"], job["parts"], job["version"], path)
+            print(f"✅ {job['part_number']} → {path} ({', '.join(job['reasons'])}, {job['seconds']:.1f}s)")
+
+        # archive entries are written at checkpoints; their jobs wait here until then
+        unsaved = collections.defaultdict(list)
+
+        def saved(names):
+            for name in names:
+                for job in unsaved.pop(name):
+                    written(job, f"{archive.path}!/{name}")
+
+        def lost(error):
+            # the queued entries are gone; the jobs stay "rendered" and are rendered again on the next run
+            for jobs in unsaved.values():
+                for job in jobs:
+                    journal.fail(job["part_number"], lang, f"{type(error).__name__}: {error}")
+                    print(f"❌ {job['part_number']}: {error}")
+            unsaved.clear()
+
+        if archive is not None:
+            archive.on_checkpoint = saved
+
+        for record, result, error, seconds in render_batch_bytes(records(), render_workers, version_for):
+            job = owners.pop(id(record))
+            if error is not None:
+                journal.fail(job["part_number"], lang, error)
+                print(f"❌ {job['part_number']}: {error}")
+                continue
+            journal.advance(job["part_number"], lang, "rendered")
+            job["seconds"] = seconds
+            filename, data = result
+            if archive is not None:
+                unsaved[archive.entry_name(lang, filename)].append(job)
+                try:
+                    archive.add(lang, filename, data, replace=True)
+                except OSError as e:
+                    lost(e)
+                continue
+            path = os.path.join(save_folder, filename)
+            try:
+                write_atomic(path, data)
+            except OSError as e:
+                journal.fail(job["part_number"], lang, f"{type(e).__name__}: {e}")
+                print(f"❌ {job['part_number']}: {e}")
+                continue
+            written(job, path)
+
+        if archive is not None:
+            try:
+                archive.checkpoint()
+            except OSError as e:
+                lost(e)
+        print(f"🔹 {added} new part numbers registered")
+        if changes:
+            print("🔁 " + ", ".join(f"{name}: {count}" for name, count in changes.most_common()))
+        for line in http_client.rate_report():
+            print(f"🚦 {line}")
+        return dict(journal.summary(), unchanged=changes["unchanged"])
 
 
-generate_all(artikels)
+if __name__ == "__main__":
+    import argparse
 
+    parser = argparse.ArgumentParser(description="Render the datasheets of an Excel import list")
+    parser.add_argument("--import-file", default=IMPORT_FILE)
+    parser.add_argument("--link-file", default=LINK_FILE)
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--lang", default=sprache)
+    parser.add_argument("--journal", help="default: one per output folder under EMICO_CACHE_DIR/jobs")
+    parser.add_argument("--snapshots", help=f"default: {SNAPSHOT_NAME} in the output folder")
+    parser.add_argument("--archive", help="write the PDFs into this ZIP archive instead of single files")
+    parser.add_argument("--no-retry", action="store_true", help="skip part numbers that failed before")
+    parser.add_argument("--new-run", action="store_true", help="start over with all part numbers (e.g. monthly)")
+    parser.add_argument("--force", action="store_true", help="render unchanged products too")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent page and image downloads")
+    parser.add_argument("--preview", action="store_true", help="only print the first URLs")
+    args = parser.parse_args()
 
+    if args.preview:
+        generate_all(load_artikels(args.import_file), args.link_file)
+    else:
+        summary = run_batch(
+            load_artikels(args.import_file), args.output, journal_path=args.journal, link_file=args.link_file,
+            lang=args.lang, retry_failed=not args.no_retry, max_workers=args.workers,
+            new_run=args.new_run, force=args.force, snapshot_path=args.snapshots, archive_path=args.archive,
+        )
+        print("🧾 " + ", ".join(f"{stage}: {count}" for stage, count in summary.items()))
@@ -0,0 +1,100 @@
+"""On-disk cache for product pages with ETag/Last-Modified revalidation."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import http_client
+from utils import cache_dir, write_atomic
+
+# "fresh": always download, "revalidate": conditional request, "offline": cache only
+MODES = ("fresh", "revalidate", "offline")
+MODE = os.environ.get("EMICO_CACHE_MODE", "revalidate")
+CACHE_DIR = cache_dir("pages")
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "not_modified": 0, "downloads": 0}
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+def _entry_paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    folder = CACHE_DIR / key[:2]
+    return folder / f"{key}.json", folder / f"{key}.body"
+
+
+def load(url):
+    """Return ``(meta, body)`` of the cached response for ``url`` or None."""
+    meta_path, body_path = _entry_paths(url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        body = body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+    return meta, body
+
+
+def store(url, response):
+    """Persist a 200 response together with its validators."""
+    meta_path, body_path = _entry_paths(url)
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "encoding": response.encoding or getattr(response, "apparent_encoding", None) or "utf-8",
+        "fetched_at": time.time(),
+    }
+    # body first: the meta file marks the entry as complete
+    write_atomic(body_path, response.content)
+    write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _decode(meta, body):
+    return body.decode(meta.get("encoding") or "utf-8", errors="replace")
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def fetch_page(url, mode=None):
+    """Return the HTML of ``url``, served from or refreshed into the cache per ``mode``."""
+    mode = mode or MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown cache mode: {mode}")
+
+    cached = load(url) if mode != "fresh" else None
+    if mode == "offline":
+        if cached is None:
+            raise CacheMiss(f"Not in page cache: {url}")
+        _count("hits")
+        return _decode(*cached)
+
+    headers = {}
+    if cached:
+        meta = cached[0]
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = http_client.fetch(url, headers=headers or None)
+    if response.status_code == 304 and cached:
+        _count("not_modified")
+        return _decode(*cached)
+
+    _count("downloads")
+    if response.status_code == 200:
+        store(url, response)
+    return response.text
+
+
+def stats():
+    """Return a snapshot of the cache counters."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,264 @@
+"""Shared, pooled HTTP transport for all page and image fetches."""
+import os
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import timing
+from rate_limit import HostLimiter
+
+# === Transport settings ===
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+POOL_SIZE = 16
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+USER_AGENT = "emico-datasheet-generator"
+
+# === Pacing per host (requests per second) ===
+RATE_LIMIT = True
+RATE_START = 5.0
+RATE_MIN = 0.5
+RATE_MAX = 40.0
+RATE_BURST = 4
+RATE_STEP = 1.0
+# healthy responses in a row before the rate is raised by RATE_STEP
+RATE_PROBE = 20
+
+# "auto" uses HTTP/2 when httpx and h2 are installed, otherwise requests
+HTTP2 = "auto"
+
+
+def _parse_overrides(value):
+    overrides = {}
+    for item in value.split(","):
+        origin, _, target = item.partition("=")
+        if origin.strip() and target.strip():
+            overrides[origin.strip().rstrip("/")] = target.strip().rstrip("/")
+    return overrides
+
+
+# send requests for an origin to another server, e.g. a local stand-in for emico.com:
+# EMICO_HOST_OVERRIDES="https://www.emico.com=http://127.0.0.1:8001,https://intellishop.sirv.com=http://127.0.0.1:8002"
+HOST_OVERRIDES = _parse_overrides(os.environ.get("EMICO_HOST_OVERRIDES", ""))
+
+_lock = threading.Lock()
+_client = None
+_backend = None
+_seen_streams = weakref.WeakSet()
+_limiters = {}
+_connection_baseline = 0
+_stats = {"requests": 0, "bytes": 0, "connections": 0, "retries": 0, "errors": 0, "http2": 0}
+
+
+def configure(**options):
+    """Override transport settings (e.g. ``READ_TIMEOUT=60``) and drop the current pool."""
+    for name, value in options.items():
+        if name not in globals() or name.startswith("_") or not name.isupper():
+            raise ValueError(f"Unknown transport option: {name}")
+        globals()[name] = value
+    close()
+
+
+def _http2_available():
+    if HTTP2 is False or HTTP2 == "off":
+        return False
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        if HTTP2 is True:
+            raise
+        return False
+
+
+def _build_client():
+    if _http2_available():
+        import httpx
+        client = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_SIZE * 4, max_keepalive_connections=POOL_SIZE),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+        return client, "httpx"
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    # one keep-alive pool per host, shared by all threads
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session, "requests"
+
+
+def get_client():
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client, _backend
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client, _backend = _build_client()
+    return _client
+
+
+def _transient_errors():
+    if _backend == "httpx":
+        import httpx
+        return (httpx.TransportError,)
+    import requests
+    return (requests.ConnectionError, requests.Timeout)
+
+
+def _apply_overrides(url):
+    for origin, target in HOST_OVERRIDES.items():
+        if url.startswith(origin) and url[len(origin):len(origin) + 1] in ("", "/", "?"):
+            return target + url[len(origin):]
+    return url
+
+
+def _limiter(url):
+    """Return the rate limiter of the host ``url`` goes to (None if pacing is off)."""
+    if not RATE_LIMIT:
+        return None
+    host = urlsplit(url).netloc
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(
+                host, RATE_START, RATE_MIN, RATE_MAX, burst=RATE_BURST, step=RATE_STEP, probe=RATE_PROBE
+            )
+    return limiter
+
+
+def _retry_after(response):
+    """Return the ``Retry-After`` of a response in seconds (delay or HTTP date), or None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(response, attempt):
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        return retry_after
+    return BACKOFF_FACTOR * (2 ** attempt)
+
+
+def _count(response):
+    timing.count("http", requests=1, bytes=len(response.content))
+    with _lock:
+        _stats["requests"] += 1
+        _stats["bytes"] += len(response.content)
+        if _backend == "httpx":
+            if response.http_version == "HTTP/2":
+                _stats["http2"] += 1
+            stream = response.extensions.get("network_stream")
+            if stream is not None and stream not in _seen_streams:
+                _seen_streams.add(stream)
+                _stats["connections"] += 1
+
+
+def fetch(url, headers=None, timeout=None, retries=None):
+    """GET ``url`` over the shared pool, paced per host and retrying transient failures with backoff.
+
+    Like ``requests.get`` the response is returned for any HTTP status; only
+    network errors that persist after all retries are raised. ``retries``
+    overrides ``MAX_RETRIES``; use 0 for requests that must not be sent twice.
+    """
+    retries = MAX_RETRIES if retries is None else retries
+    client = get_client()
+    url = _apply_overrides(url)
+    limiter = _limiter(url)
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    if _backend == "httpx":
+        import httpx
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+    transient = _transient_errors()
+
+    for attempt in range(retries + 1):
+        response = None
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            response = client.get(url, headers=headers, timeout=timeout)
+        except transient:
+            with _lock:
+                _stats["errors"] += 1
+            if attempt == retries:
+                raise
+        else:
+            _count(response)
+            if limiter is not None:
+                limiter.observe(response.status_code, _retry_after(response))
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+        with _lock:
+            _stats["retries"] += 1
+        time.sleep(_retry_delay(response, attempt))
+
+
+def _pool_connections():
+    # urllib3 counts every connection it opens per host pool
+    if _backend != "requests":
+        return 0
+    pools = _client.get_adapter("https://").poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+
+def stats():
+    """Return a snapshot of the transport counters."""
+    with _lock:
+        snapshot = dict(_stats)
+        backend = _backend
+        if backend == "requests":
+            snapshot["connections"] = _pool_connections() - _connection_baseline
+        limiters = dict(_limiters)
+    snapshot["reused"] = max(snapshot["requests"] - snapshot["connections"], 0)
+    snapshot["backend"] = backend
+    snapshot["hosts"] = {host: limiter.stats() for host, limiter in limiters.items()}
+    return snapshot
+
+
+def rate_report():
+    """Return one line per host with the achieved and the current allowed request rate."""
+    return [
+        f"{host}: {s['achieved']:.1f}/s achieved, limit {s['rate']:.1f}/s, "
+        f"{s['throttled']} throttled, {s['waited']:.1f}s waited"
+        for host, s in stats()["hosts"].items()
+    ]
+
+
+def reset_stats():
+    global _connection_baseline
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+        _connection_baseline = _pool_connections()
+
+
+def close():
+    """Close all pooled connections; the next fetch opens a new pool."""
+    global _client, _backend, _connection_baseline
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = _backend = None
+        _connection_baseline = 0
+        _seen_streams.clear()
+        # new settings take effect with fresh limiters
+        _limiters.clear()
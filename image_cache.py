@@ -0,0 +1,221 @@
+"""Content-addressed image store shared across languages and runs.
+
+Images are looked up by their normalized sirv.com URL (as produced by
+``page_parser.get_images_links``). The bytes live in a bounded in-memory LRU
+and on disk under their SHA-256, so identical images are stored once.
+Each URL entry keeps the ETag/Last-Modified of its download, so
+``revalidate`` can check a cached image with a conditional request.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import http_cache
+import http_client
+from disk_cache import DiskBudget
+from utils import cache_dir, write_atomic
+
+MEMORY_LIMIT = 64 * 1024 * 1024
+DISK_LIMIT = 1024 * 1024 * 1024
+CACHE_DIR = cache_dir("images")
+
+_lock = threading.Lock()
+_memory = OrderedDict()     # content hash -> bytes, least recently used first
+_memory_size = 0
+_url_index = {}             # normalized URL -> content hash
+_inflight = {}              # normalized URL -> Future of a running download
+_checked = set()            # normalized URLs revalidated by this process
+# URL entries pointing at evicted blobs are treated as misses
+_disk = DiskBudget(CACHE_DIR / "blobs", DISK_LIMIT)
+_stats = {"memory_hits": 0, "disk_hits": 0, "downloads": 0, "not_modified": 0, "bytes_downloaded": 0}
+
+
+def normalize_url(url):
+    return url.strip()
+
+
+def _url_path(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return CACHE_DIR / "urls" / key[:2] / key
+
+
+def _blob_path(digest):
+    return CACHE_DIR / "blobs" / digest[:2] / digest
+
+
+def _remember(url, digest, content):
+    global _memory_size
+    with _lock:
+        _url_index[url] = digest
+        if digest in _memory:
+            _memory.move_to_end(digest)
+            return
+        _memory[digest] = content
+        _memory_size += len(content)
+        while _memory_size > MEMORY_LIMIT and len(_memory) > 1:
+            _, evicted = _memory.popitem(last=False)
+            _memory_size -= len(evicted)
+
+
+def _from_memory(url):
+    with _lock:
+        digest = _url_index.get(url)
+        if digest in _memory:
+            _memory.move_to_end(digest)
+            _stats["memory_hits"] += 1
+            return _memory[digest]
+    return None
+
+
+def _read_entry(url):
+    """Return the ``{"digest", "etag", "last_modified"}`` stored for ``url``, or None."""
+    try:
+        text = _url_path(url).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    # entries written before the validators were kept hold just the digest
+    if not text.startswith("{"):
+        return {"digest": text}
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _from_disk(url):
+    entry = _read_entry(url)
+    if entry is None:
+        return None
+    digest = entry["digest"]
+    try:
+        blob = _blob_path(digest)
+        content = blob.read_bytes()
+    except (OSError, ValueError):
+        return None
+    _disk.touch(blob)  # mark as recently used for eviction
+    with _lock:
+        _stats["disk_hits"] += 1
+    _remember(url, digest, content)
+    return content
+
+
+def _store(url, content, response=None):
+    digest = hashlib.sha256(content).hexdigest()
+    _remember(url, digest, content)
+    try:
+        blob = _blob_path(digest)
+        if not blob.exists():
+            write_atomic(blob, content)
+            _disk.added(len(content))
+        entry = {"digest": digest}
+        if response is not None:
+            entry["etag"] = response.headers.get("ETag")
+            entry["last_modified"] = response.headers.get("Last-Modified")
+        write_atomic(_url_path(url), json.dumps(entry).encode("utf-8"))
+    except OSError:
+        # a read-only or full disk only costs us the persistent tier
+        pass
+
+
+def _save(url, response):
+    response.raise_for_status()
+    content = response.content
+    with _lock:
+        _stats["downloads"] += 1
+        _stats["bytes_downloaded"] += len(content)
+    _store(url, content, response)
+    return content
+
+
+def _download(url):
+    return _save(url, http_client.fetch(url))
+
+
+def get_image(url):
+    """Return the bytes of the image at ``url``, downloading it at most once."""
+    url = normalize_url(url)
+    content = _from_memory(url)
+    if content is not None:
+        return content
+
+    # concurrent callers for the same URL wait for a single download
+    with _lock:
+        future = _inflight.get(url)
+        owner = future is None
+        if owner:
+            future = _inflight[url] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        content = _from_disk(url)
+        if content is None:
+            content = _download(url)
+        future.set_result(content)
+        return content
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            del _inflight[url]
+
+
+def revalidate(url, mode=None):
+    """Return the bytes of the image at ``url`` after checking the cached copy against the server.
+
+    ``mode`` is a page cache mode (default ``http_cache.MODE``): "revalidate"
+    sends a conditional request with the stored ETag/Last-Modified, "fresh"
+    downloads again and "offline" is ``get_image``. A changed image replaces
+    the cached one. Each URL is checked once per process.
+    """
+    url = normalize_url(url)
+    mode = mode or http_cache.MODE
+    if mode not in http_cache.MODES:
+        raise ValueError(f"Unknown cache mode: {mode}")
+    with _lock:
+        checked = url in _checked
+    if mode == "offline" or checked:
+        return get_image(url)
+
+    entry = _read_entry(url) if mode == "revalidate" else None
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    response = http_client.fetch(url, headers=headers or None)
+    content = None
+    if response.status_code == 304:
+        content = _from_memory(url) or _from_disk(url)
+        if content is not None:
+            with _lock:
+                _stats["not_modified"] += 1
+        else:
+            # the blob was evicted in the meantime
+            response = http_client.fetch(url)
+    if content is None:
+        content = _save(url, response)
+    with _lock:
+        _checked.add(url)
+    return content
+
+
+def stats():
+    """Return a snapshot of the cache counters."""
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot["memory_bytes"] = _memory_size
+    return snapshot
+
+
+def clear_memory():
+    global _memory_size
+    with _lock:
+        _memory.clear()
+        _url_index.clear()
+        _checked.clear()
+        _memory_size = 0
@@ -0,0 +1,130 @@
+"""Downscale images to their printed size before they are embedded.
+
+The sirv.com originals are far larger than the few centimetres they occupy on
+a datasheet. ``prepare_image`` resamples them to the printed size at ``DPI``
+and re-encodes them in a mode ReportLab embeds compactly. Results are cached
+per (image, box, dpi) in memory and on disk; the disk tier is kept below
+``DISK_LIMIT`` like the source image cache.
+"""
+import hashlib
+import io
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from disk_cache import DiskBudget
+from utils import cache_dir, write_atomic
+
+DPI = int(os.environ.get("EMICO_IMAGE_DPI", 200))
+JPEG_QUALITY = 85
+MEMORY_ENTRIES = 256
+DISK_LIMIT = 512 * 1024 * 1024
+CACHE_DIR = cache_dir("derived")
+
+_lock = threading.Lock()
+_memory = OrderedDict()     # cache key -> (bytes, width, height)
+_disk = DiskBudget(CACHE_DIR, DISK_LIMIT)
+
+
+def fit_size(iw, ih, max_width, max_height):
+    """Scale (iw, ih) down to fit the box, keeping the aspect ratio (never enlarges)."""
+    aspect = ih / iw
+    if iw > max_width:
+        iw = max_width
+        ih = iw * aspect
+    if ih > max_height:
+        ih = max_height
+        iw = ih / aspect
+    return iw, ih
+
+
+def _resample(content, max_width, max_height, dpi):
+    """Return ``(bytes, width, height)``: the image as embedded and its size in points."""
+    from PIL import Image as PILImage
+
+    src = PILImage.open(io.BytesIO(content))
+    width, height = fit_size(src.width, src.height, max_width, max_height)
+    target = (max(1, math.ceil(width / 72 * dpi)), max(1, math.ceil(height / 72 * dpi)))
+    resize = src.width > target[0] or src.height > target[1]
+
+    is_jpeg = src.format == "JPEG"
+    has_alpha = src.mode in ("RGBA", "LA", "PA") or "transparency" in src.info
+    if is_jpeg:
+        mode = "L" if src.mode == "L" else "RGB"
+    elif has_alpha:
+        mode = "LA" if src.mode in ("L", "LA") else "RGBA"
+    else:
+        mode = "L" if src.mode in ("1", "L") else "RGB"
+
+    if not resize and src.mode == mode and src.format in ("JPEG", "PNG"):
+        # already small enough and embeddable as is
+        return content, width, height
+
+    if is_jpeg and resize:
+        # let libjpeg decode at a reduced scale first, far cheaper than full size
+        src.draft(mode, target)
+    img = src.convert(mode)
+    if resize:
+        img = img.resize(target, PILImage.LANCZOS)
+
+    out = io.BytesIO()
+    if is_jpeg:
+        img.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    else:
+        # drawings and line art stay lossless
+        img.save(out, "PNG")
+    return out.getvalue(), width, height
+
+
+def _cache_key(content, max_width, max_height, dpi):
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{digest}-{max_width:.2f}x{max_height:.2f}-{dpi}"
+
+
+def _load(key):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    path = CACHE_DIR / key[:2] / key
+    try:
+        header, data = path.read_bytes().split(b"\n", 1)
+        width, height = (float(v) for v in header.split())
+    except (OSError, ValueError):
+        return None
+    _disk.touch(path)  # mark as recently used for eviction
+    result = (data, width, height)
+    _remember(key, result)
+    return result
+
+
+def _remember(key, result):
+    with _lock:
+        _memory[key] = result
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _save(key, result):
+    _remember(key, result)
+    data, width, height = result
+    path = CACHE_DIR / key[:2] / key
+    try:
+        entry = f"{width!r} {height!r}\n".encode("ascii") + data
+        write_atomic(path, entry)
+    except OSError:
+        return
+    _disk.added(len(entry))
+
+
+def prepare_image(content, max_width, max_height, dpi=None):
+    """Return ``(bytes, width, height)`` of ``content`` fitted into the box at ``dpi``."""
+    dpi = dpi or DPI
+    key = _cache_key(content, max_width, max_height, dpi)
+    result = _load(key)
+    if result is None:
+        result = _resample(content, max_width, max_height, dpi)
+        _save(key, result)
+    return result
+
@@ -0,0 +1,145 @@
+"""SQLite journal of a batch run: the last completed stage of every part number.
+
+A rerun reads the journal and continues each item after its last completed
+stage; finished items are skipped and failed ones are retried. Scraped
+records are kept in the journal, so resuming does not scrape them again.
+"""
+import json
+import sqlite3
+import time
+
+from product_record import ProductRecord
+from utils import sqlite_journal_mode
+
+STAGES = ("pending", "resolved", "scraped", "images", "rendered", "written")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    part_number TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT 'pending',
+    status TEXT NOT NULL DEFAULT 'ok',
+    url TEXT,
+    record TEXT,
+    output TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated REAL,
+    PRIMARY KEY (part_number, lang)
+)
+"""
+
+
+class JobJournal:
+    """Stage and status per ``(part_number, lang)``; ``status`` is "ok" or "failed" (at the next stage)."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        # WAL keeps every commit cheap, so each stage can be committed right away (not on network shares)
+        self._db.execute(f"PRAGMA journal_mode={sqlite_journal_mode(self.path)}")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def add_many(self, part_numbers, lang, chunk_size=500):
+        """Register part numbers (known ones are kept as they are); returns the number of new jobs."""
+        return sum(len(jobs) for jobs in self.register(part_numbers, lang, chunk_size))
+
+    def register(self, part_numbers, lang, chunk_size=500):
+        """Register part numbers chunk by chunk; yields the new jobs of each chunk once it is committed.
+
+        Known part numbers are kept as they are, so a caller can start on
+        the first chunk while ``part_numbers`` is still being read.
+        """
+        chunk = []
+        for part_number in part_numbers:
+            chunk.append((part_number, lang, time.time()))
+            if len(chunk) >= chunk_size:
+                yield self._insert(chunk, lang)
+                chunk = []
+        if chunk:
+            yield self._insert(chunk, lang)
+
+    def _insert(self, rows, lang):
+        last = self._db.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+        self._db.executemany("INSERT OR IGNORE INTO jobs (part_number, lang, updated) VALUES (?, ?, ?)", rows)
+        self._db.commit()
+        # new rows get rowids after the largest one; ignored ones keep theirs
+        return self._jobs("lang = ? AND rowid > ?", (lang, last))
+
+    def _jobs(self, where, params):
+        query = f"SELECT part_number, lang, stage, status, url, attempts FROM jobs WHERE {where} ORDER BY rowid"
+        return [dict(row) for row in self._db.execute(query, params)]
+
+    def restart(self, lang):
+        """Reset all jobs of ``lang`` to pending, dropping their records, for a new run over the same list."""
+        self._db.execute(
+            "UPDATE jobs SET stage = 'pending', status = 'ok', url = NULL, record = NULL, output = NULL,"
+            " error = NULL, attempts = 0, updated = ? WHERE lang = ?",
+            (time.time(), lang),
+        )
+        self._db.commit()
+
+    def get(self, part_number, lang):
+        row = self._db.execute(
+            "SELECT * FROM jobs WHERE part_number = ? AND lang = ?", (part_number, lang)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def advance(self, part_number, lang, stage, url=None, record=None, output=None):
+        """Mark ``stage`` as completed and store what it produced."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        self._db.execute(
+            "UPDATE jobs SET stage = ?, status = 'ok', error = NULL, updated = ?,"
+            " url = COALESCE(?, url), record = COALESCE(?, record), output = COALESCE(?, output)"
+            " WHERE part_number = ? AND lang = ?",
+            (stage, time.time(), url, json.dumps(record, ensure_ascii=False) if record is not None else None,
+             output, part_number, lang),
+        )
+        self._db.commit()
+
+    def fail(self, part_number, lang, error):
+        """Record a failure of the stage after the current one."""
+        self._db.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, attempts = attempts + 1, updated = ?"
+            " WHERE part_number = ? AND lang = ?",
+            (str(error), time.time(), part_number, lang),
+        )
+        self._db.commit()
+
+    def todo(self, lang, retry_failed=True):
+        """Return the unfinished jobs of ``lang`` (without the failed ones unless ``retry_failed``).
+
+        The stored records are not included; load them with ``record``.
+        """
+        where = "lang = ? AND stage != 'written'"
+        if not retry_failed:
+            where += " AND status != 'failed'"
+        return self._jobs(where, (lang,))
+
+    def record(self, part_number, lang):
+        """Return the scraped record stored for a job, or None."""
+        row = self._db.execute(
+            "SELECT record FROM jobs WHERE part_number = ? AND lang = ?", (part_number, lang)
+        ).fetchone()
+        return ProductRecord.from_tuple(json.loads(row[0])) if row and row[0] else None
+
+    def summary(self):
+        """Return ``{stage: count}`` plus ``"failed"``, the number of jobs whose last attempt failed."""
+        counts = dict.fromkeys(STAGES, 0)
+        for stage, count in self._db.execute("SELECT stage, COUNT(*) FROM jobs GROUP BY stage"):
+            counts[stage] = count
+        counts["failed"] = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'failed'").fetchone()[0]
+        return counts
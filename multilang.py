@@ -0,0 +1,66 @@
+"""Render the datasheets of one product in all languages in a single job.
+
+The language pages are fetched concurrently and rendered in one process, so
+the product images are downloaded once (``image_cache``) and the template is
+built once for all of them.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import http_cache
+import part_index
+import timing
+from main import get_emico_data
+from page_parser import get_language_links, parse_emico_page
+from pdf_generator import generate_emico_pdf
+from product_record import ProductRecord
+from utils import LANGUAGES, extract_language, language_url
+
+
+def lookup_product_url(part_number, link_file=part_index.LINK_FILE):
+    """Return the product URL for a part number from the ``url`` sheet of the link workbook."""
+    return part_index.resolve(part_number, link_file=link_file)
+
+
+def sibling_urls(url, html, languages=LANGUAGES):
+    """Return ``{lang: url}`` for all languages, from the page's hreflang links or the URL pattern."""
+    alternates = get_language_links(html)
+    return {lang: alternates.get(lang) or language_url(url, lang) for lang in languages}
+
+
+def render_all_languages(source, save_folder, languages=LANGUAGES, cache_mode=None):
+    """Render one product in every language.
+
+    ``source`` is a part number or the product URL in any language. Yields
+    ``(lang, output_filename, error)`` as each datasheet is written; ``error``
+    is None on success.
+    """
+    source = str(source).strip()
+    url = source if "://" in source else lookup_product_url(source)
+    source_lang = extract_language(url)
+    with timing.stage("fetch") as stage:
+        html = http_cache.fetch_page(url, mode=cache_mode)
+        stage["chars"] = len(html)
+    urls = sibling_urls(url, html, languages)
+
+    def scrape(lang):
+        if lang == source_lang:
+            # already downloaded to find the siblings
+            with timing.stage("parse"):
+                record = ProductRecord(*parse_emico_page(html, lang), lang)
+            timing.count("parse", image_links=len(record.clean_links))
+            return record
+        if not urls[lang]:
+            raise LookupError(f"No {lang} URL for {url}")
+        return get_emico_data(urls[lang], cache_mode=cache_mode, lang=lang)
+
+    with ThreadPoolExecutor(max_workers=len(languages)) as pool:
+        futures = {pool.submit(timing.bind(scrape), lang): lang for lang in languages}
+        # render each language as soon as its page is in, while the others still load
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                output_filename = generate_emico_pdf(*future.result(), save_folder=save_folder)
+            except Exception as e:
+                yield lang, None, e
+            else:
+                yield lang, output_filename, None
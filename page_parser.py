@@ -0,0 +1,199 @@
+"""Selective parser for Emico product pages.
+
+Only the subtrees ``get_emico_data`` reads are turned into BeautifulSoup
+trees: the product info column and the spec container. Image links are taken
+from the raw HTML.
+"""
+import re
+
+IMAGE_LINK_RE = re.compile(r"https://intellishop\.sirv\.com/[^\s\"'>]+")
+ARTIKEL_TAG_RE = re.compile("|".join(["Artikel", "Part", "pieza", "article", "Articolo"]), re.I)
+
+# (article number, old article number) per page language
+LANGUAGE_RULES = {
+    "de": (
+        re.compile(r"Artikel[-\s]?Nr\.\s*([0-9]+)"),
+        re.compile(r"Alte\s+Artikelnummer:\s*([0-9]+)"),
+    ),
+    "en": (
+        re.compile(r"Part\s*no\.?\s*([0-9]+)"),
+        re.compile(r"Old\s*(item|part)\s*(number|no\.?):\s*([0-9]+)"),
+    ),
+    "es": (
+        re.compile(r"N[º°]?\s*de\s*pieza\s*([0-9]+)"),
+        re.compile(r"N[úu]mero\s+de\s+art[ií]culo\s+antiguo:\s*([0-9]+)"),
+    ),
+    "fr": (
+        re.compile(r"No\.\s*d['’]article\s*([0-9]+)"),
+        re.compile(r"ancien\s+num[ée]ro\s+d['’]article:\s*([0-9]+)"),
+    ),
+    "it": (
+        re.compile(r"Articolo\s*n\.?\s*([0-9]+)"),
+        re.compile(r"vecchio\s+numero\s+d['’]articolo:\s*([0-9]+)"),
+    ),
+}
+
+INFO_SECTION_CLASSES = ("col-lg-6", "col-xl-8", "ps-lg-4", "ps-xl-5")
+SPEC_CONTAINER_CLASSES = ("container", "my-3")
+SPEC_ROW_CLASSES = ("row", "is-flex-table__row")
+
+_section_xpaths = None
+_language_links_xpath = None
+
+
+def _has_classes(classes):
+    wanted = set(classes)
+
+    def match(tag):
+        return tag.name == "div" and wanted.issubset(tag.get("class") or ())
+    return match
+
+
+_is_info_section = _has_classes(INFO_SECTION_CLASSES)
+_is_spec_container = _has_classes(SPEC_CONTAINER_CLASSES)
+_is_spec_row = _has_classes(SPEC_ROW_CLASSES)
+
+
+def _xpath_classes(classes):
+    return " and ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes
+    )
+
+
+def _get_section_xpaths():
+    global _section_xpaths
+    if _section_xpaths is None:
+        from lxml import etree
+        _section_xpaths = (
+            (etree.XPath(f"(//div[{_xpath_classes(INFO_SECTION_CLASSES)}])[1]"), _is_info_section),
+            (etree.XPath(f"(//div[{_xpath_classes(SPEC_CONTAINER_CLASSES)}])[1]"), _is_spec_container),
+        )
+    return _section_xpaths
+
+
+def select_sections(html):
+    """Return the info section and spec container of a page as BeautifulSoup tags (None if missing).
+
+    libxml2 locates both subtrees; only those are handed to BeautifulSoup,
+    so the Python-side tree holds a few dozen tags instead of the whole page.
+    """
+    import lxml.html
+    from lxml import etree
+    from bs4 import BeautifulSoup
+
+    try:
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        root = lxml.html.fromstring(html.encode("utf-8"), parser=parser)
+    except etree.ParserError:
+        # empty document
+        return None, None
+
+    sections = []
+    for xpath, matcher in _get_section_xpaths():
+        found = xpath(root)
+        if not found:
+            sections.append(None)
+            continue
+        fragment = lxml.html.tostring(found[0], encoding="unicode", with_tail=False)
+        sections.append(BeautifulSoup(fragment, "lxml").find(matcher))
+    return tuple(sections)
+
+
+def get_language_links(html):
+    """Return ``{lang: url}`` of the page's hreflang alternates (e.g. ``en-DE`` -> ``en``)."""
+    global _language_links_xpath
+    import lxml.html
+    from lxml import etree
+
+    if _language_links_xpath is None:
+        _language_links_xpath = etree.XPath("//link[@rel='alternate'][@hreflang][@href]")
+    try:
+        root = lxml.html.fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:
+        return {}
+
+    links = {}
+    for link in _language_links_xpath(root):
+        lang = link.get("hreflang").strip()[:2].lower()
+        if lang in LANGUAGE_RULES and lang not in links:
+            links[lang] = link.get("href").strip()
+    return links
+
+
+def get_images_links(html):
+    """Return the distinct sirv.com image URLs, cut after their .jpg/.png extension."""
+    clean_links = []
+    for link in set(IMAGE_LINK_RE.findall(html)):
+        lower = link.lower()
+        if ".jpg" in lower:
+            link = link[: lower.find(".jpg") + 4]
+        elif ".png" in lower:
+            link = link[: lower.find(".png") + 4]
+        clean_links.append(link)
+    return list(set(clean_links))
+
+
+def get_basic_info(info_section, lang):
+    product_info = {}
+    if not info_section:
+        return product_info
+
+    # --- product name ---
+    name_tag = info_section.find("h1")
+    if name_tag:
+        product_info["product_name"] = name_tag.get_text(strip=True)
+
+    rules = LANGUAGE_RULES.get(lang)
+    if rules is None:
+        # strict: don't proceed if unsupported
+        raise ValueError(f"Unsupported language: {lang}")
+    artikel_regex, alt_artikel_regex = rules
+
+    # --- artikel tag ---
+    artikel_tag = info_section.find("p", string=ARTIKEL_TAG_RE)
+    if artikel_tag:
+        text = artikel_tag.get_text(strip=True)
+
+        match = artikel_regex.search(text)
+        if match:
+            product_info["artikelnummer"] = match.groups()[-1]  # works for both single/multiple groups
+
+        match_alt = alt_artikel_regex.search(text)
+        if match_alt:
+            product_info["alte_artikelnummer"] = match_alt.groups()[-1]
+
+    # --- description ---
+    desc_tag = info_section.select_one("div.is-detail-page__description p")
+    if desc_tag:
+        product_info["beschreibung"] = str(desc_tag)
+
+    return product_info
+
+
+def extract_specs(container, group_id):
+    specs = {}
+    if not container:
+        return specs
+    group = container.find("div", id=group_id)
+    if group:
+        for row in group.find_all(_is_spec_row):
+            cols = row.find_all("div")
+            if len(cols) >= 2:
+                key = cols[0].get_text(strip=True)
+                key = key[0].upper() + key[1:]
+                value = cols[1].get_text(strip=True)
+                specs[key] = value
+    return specs
+
+
+def parse_emico_page(html, lang):
+    """Return ``(basic_info, base_specs, technical_specs, drawing_data, clean_links)`` for a product page."""
+    clean_links = get_images_links(html)
+    info_section, container = select_sections(html)
+    basic_info = get_basic_info(info_section, lang)
+
+    base_specs = extract_specs(container, "group-2")
+    technical_specs = extract_specs(container, "group-3")
+    drawing_data = extract_specs(container, "group-6")
+
+    return basic_info, base_specs, technical_specs, drawing_data, clean_links
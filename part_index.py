@@ -0,0 +1,192 @@
+"""Part number -> product URL index built from the ``url`` sheet of the link workbook.
+
+The sheet is read once and turned into a dict keyed by normalized part
+number. The dict is pickled under ``cache_dir("index")`` and reused as long
+as the workbook is unchanged (same mtime and size, or else the same content
+hash), so lookups no longer scan the sheet. URLs ingested from the sitemap
+(``sitemap_ingest``) are kept next to it and take precedence over the sheet.
+"""
+import hashlib
+import os
+import pickle
+import re
+import threading
+
+from utils import cache_dir, write_atomic
+
+LINK_FILE = "Mappe1.xlsx"
+SHEET_NAME = "url"
+CACHE_DIR = cache_dir("index")
+SITEMAP_CACHE = CACHE_DIR / "sitemap.pickle"
+# bump when the pickled layout changes
+INDEX_VERSION = 1
+
+_URL_LANG_RE = re.compile(r"/([a-z]{2})-[A-Z]{2}/")
+_URL_PART_RE = re.compile(r"-(\d+)/?$")
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def normalize_part_number(value):
+    """Return the canonical form of a part number as typed in Excel ("300012056", 300012056.0, " 300 012 056")."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip().lstrip("'")
+    if re.fullmatch(r"\d+\.0+", text):
+        text = text.split(".")[0]
+    return re.sub(r"\s+", "", text).upper()
+
+
+def url_language(url):
+    match = _URL_LANG_RE.search(url)
+    return match.group(1) if match else None
+
+
+def part_number_from_url(url):
+    """Return the part number at the end of a product URL (".../o-ring-300012056"), or ""."""
+    match = _URL_PART_RE.search(url)
+    return normalize_part_number(match.group(1)) if match else ""
+
+
+class PartIndex:
+    """``{part number: {lang: url}}`` with normalized keys."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, part_number):
+        return normalize_part_number(part_number) in self.entries
+
+    def urls(self, part_number):
+        """Return ``{lang: url}`` of a part number (empty if unknown)."""
+        return dict(self.entries.get(normalize_part_number(part_number), {}))
+
+    def lookup(self, part_number, lang=None):
+        """Return the URL of a part number in ``lang`` (German or the first one if None), or None."""
+        urls = self.entries.get(normalize_part_number(part_number))
+        if not urls:
+            return None
+        if lang:
+            return urls.get(lang)
+        return urls.get("de") or next(iter(urls.values()))
+
+
+def _build(link_file, sheet_name):
+    from excel_ingest import iter_columns
+
+    entries = {}
+    # streamed row by row: memory grows with the index, not with the sheet
+    for url, key in iter_columns(link_file, sheet_name, ("loc", "Spalte1")):
+        if not isinstance(url, str) or not url.strip():
+            continue
+        url = url.strip()
+        key = normalize_part_number(key) or part_number_from_url(url)
+        if key:
+            # the first row wins, as with the former .iloc[0] lookups
+            entries.setdefault(key, {}).setdefault(url_language(url) or "de", url)
+    return entries
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(link_file, sheet_name):
+    key = hashlib.sha1(f"{os.path.abspath(link_file)}|{sheet_name}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.pickle"
+
+
+def _read_cache(path):
+    try:
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != INDEX_VERSION:
+        return None
+    return cached
+
+
+def _write_cache(path, cached):
+    write_atomic(path, pickle.dumps(cached, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_sitemap_state():
+    """Return the state stored by ``sitemap_ingest`` (with its ``entries``), or None."""
+    return _read_cache(SITEMAP_CACHE)
+
+
+def write_sitemap_state(state):
+    _write_cache(SITEMAP_CACHE, dict(state, version=INDEX_VERSION))
+
+
+def _sheet_entries(link_file, sheet_name, signature):
+    path = _cache_path(link_file, sheet_name)
+    cached = _read_cache(path)
+    if cached is None or cached["signature"] != signature:
+        # touched but maybe not changed (copied, re-saved): compare the content
+        content_hash = _file_hash(link_file)
+        if cached is None or cached["sha256"] != content_hash:
+            cached = {"version": INDEX_VERSION, "sha256": content_hash,
+                      "entries": _build(link_file, sheet_name)}
+        cached["signature"] = signature
+        try:
+            _write_cache(path, cached)
+        except OSError:
+            pass
+    return cached["entries"]
+
+
+def load_index(link_file=LINK_FILE, sheet_name=SHEET_NAME):
+    """Return the ``PartIndex`` of a link workbook plus the ingested sitemap, from memory or the pickle caches.
+
+    Either source may be missing, but not both.
+    """
+    signature = _signature(link_file)
+    sitemap_signature = _signature(SITEMAP_CACHE)
+    if signature is None and sitemap_signature is None:
+        raise FileNotFoundError(f"Neither {link_file} nor an ingested sitemap is available")
+    memo_key = (os.path.abspath(link_file), sheet_name)
+    with _lock:
+        index = _loaded.get(memo_key)
+        if index is not None and index[0] == (signature, sitemap_signature):
+            return index[1]
+
+        entries = _sheet_entries(link_file, sheet_name, signature) if signature else {}
+        sitemap = read_sitemap_state() if sitemap_signature else None
+        if sitemap and sitemap["entries"]:
+            # the sitemap is the fresher source: its URLs replace those of the sheet per language
+            entries = dict(entries)
+            for key, urls in sitemap["entries"].items():
+                entries[key] = {**entries.get(key, {}), **urls}
+
+        index = PartIndex(entries)
+        _loaded[memo_key] = ((signature, sitemap_signature), index)
+        return index
+
+
+def resolve(part_number, lang=None, link_file=LINK_FILE):
+    """Return the product URL of a part number; raises ``LookupError`` if it is unknown."""
+    url = load_index(link_file).lookup(part_number, lang)
+    if url is None:
+        suffix = f" ({lang})" if lang else ""
+        raise LookupError(f"No URL found for part number {part_number}{suffix}")
+    return url
@@ -0,0 +1,97 @@
+"""Image resources for the PDF writer: JPEG passthrough and per-document dedup."""
+import functools
+import hashlib
+import io
+import os
+
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable
+
+import image_pipeline
+import timing
+from utils import resource_path
+
+# embed image streams as binary; ASCII85 would inflate every image by a quarter
+rl_config.useA85 = 0
+
+
+class SharedImage:
+    """Encoded image bytes that ``canvas.drawImage`` embeds once per document.
+
+    ReportLab names the XObject of anything that is not an ImageReader after
+    ``str(image)``; naming it after the content hash makes identical images
+    share one XObject without decoding them first. JPEG bytes are copied into
+    the PDF unchanged (DCTDecode), other formats are decoded once per object.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.digest = hashlib.sha1(content).hexdigest()
+        self._reader = None
+
+    def __str__(self):
+        return f"emico-image-{self.digest}"
+
+    def jpeg_fh(self):
+        if self.content.startswith(b"\xff\xd8"):
+            return io.BytesIO(self.content)
+        return None
+
+    def __getattr__(self, name):
+        # getSize/getRGBData/mode/_dataA/getTransparent for non-JPEG images
+        if name.startswith("__") or name == "_reader":
+            raise AttributeError(name)
+        if self._reader is None:
+            self._reader = ImageReader(io.BytesIO(self.content))
+        return getattr(self._reader, name)
+
+
+class SharedImageFlowable(Flowable):
+    """Flowable drawing a ``SharedImage`` at a fixed size."""
+
+    def __init__(self, image, width, height, hAlign="CENTER"):
+        Flowable.__init__(self)
+        self.image = image
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = hAlign
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        self.canv.drawImage(
+            self.image,
+            getattr(self, "_offs_x", 0),
+            getattr(self, "_offs_y", 0),
+            self.drawWidth,
+            self.drawHeight,
+            mask="auto",
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def shared_image(content):
+    """Return the ``SharedImage`` for ``content``, reusing decoded pixels across documents."""
+    return SharedImage(content)
+
+
+@functools.lru_cache(maxsize=None)
+def asset_image(relative_path, max_width=None, max_height=None):
+    """Return a bundled asset as ``SharedImage`` (resampled to the box if given), or None if missing."""
+    path = resource_path(relative_path)
+    if not os.path.exists(path):
+        return None
+    content = path.read_bytes()
+    if max_width and max_height:
+        content, _, _ = image_pipeline.prepare_image(content, max_width, max_height)
+    return SharedImage(content)
+
+
+def product_image(content, max_width, max_height):
+    """Return a flowable of ``content`` resampled to fit the box."""
+    with timing.stage("image_decode", images=1, bytes_in=len(content)) as stage:
+        content, width, height = image_pipeline.prepare_image(content, max_width, max_height)
+        stage["bytes_out"] = len(content)
+    return SharedImageFlowable(shared_image(content), width, height)
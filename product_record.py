@@ -0,0 +1,32 @@
+"""The scraped data of one product page."""
+from typing import NamedTuple
+
+
+class ProductRecord(NamedTuple):
+    """What ``get_emico_data`` returns; still unpacks like the former 6-tuple.
+
+    A named tuple has no per-instance ``__dict__``, so a record costs no
+    more memory than the plain tuple did.
+    """
+    basic_info: dict
+    base_specs: dict
+    technical_specs: dict
+    drawing_data: dict
+    clean_links: list
+    lang: str
+
+    @property
+    def artikelnummer(self):
+        return self.basic_info.get("artikelnummer")
+
+    def to_dict(self):
+        return {name: value for name, value in zip(self._fields, self)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls._fields})
+
+    @classmethod
+    def from_tuple(cls, record):
+        """Return ``record`` as a ``ProductRecord`` (it may be a plain tuple or a JSON list)."""
+        return record if isinstance(record, cls) else cls(*record)
@@ -0,0 +1,98 @@
+"""Adaptive token bucket that paces the requests to one host.
+
+The bucket starts at a moderate rate. A 429 or 503 halves the rate and,
+with ``Retry-After``, pauses the host; after a run of healthy responses the
+rate is raised again by a small step. Additive increase and multiplicative
+decrease settle near the highest rate the host accepts, instead of swinging
+between idle and throttled.
+"""
+import threading
+import time
+from collections import deque
+
+THROTTLE_STATUSES = (429, 503)
+# window for the achieved rate
+WINDOW = 10.0
+
+
+class HostLimiter:
+    """Token bucket for one host; ``acquire`` before each request, ``observe`` each response."""
+
+    def __init__(self, host, rate, min_rate, max_rate, burst=4, step=1.0, probe=20):
+        self.host = host
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.burst = float(burst)
+        self.step = float(step)
+        self.probe = probe
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._healthy = 0
+        self._recent = deque()
+        self._first = None
+        self._stats = {"requests": 0, "throttled": 0, "waited": 0.0}
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until one is available; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            # during a pause ``_updated`` is its end: no tokens accrue before it
+            self._refill(max(now, self._updated))
+            # the token is reserved right away, so concurrent callers queue up behind each other
+            self._tokens -= 1
+            wait = max(self._updated - now, 0.0) + max(-self._tokens / self.rate, 0.0)
+            start = now + wait
+            self._recent.append(start)
+            while self._recent and self._recent[0] < start - WINDOW:
+                self._recent.popleft()
+            if self._first is None:
+                self._first = start
+            self._stats["requests"] += 1
+            self._stats["waited"] += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def observe(self, status, retry_after=None):
+        """Adapt the rate to a response status (and its ``Retry-After`` in seconds)."""
+        with self._lock:
+            if status in THROTTLE_STATUSES:
+                self._stats["throttled"] += 1
+                self._healthy = 0
+                now = time.monotonic()
+                self._refill(max(now, self._updated))
+                self.rate = max(self.min_rate, self.rate / 2)
+                # drop the saved-up burst so the slower rate applies at once
+                self._tokens = min(self._tokens, 0.0)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                    # the bucket refills from the end of the pause on, so the callers queued
+                    # during it are spread out at the reduced rate instead of all going at once
+                    self._updated = max(self._updated, self._paused_until)
+            elif status < 500:
+                self._healthy += 1
+                if self._healthy >= self.probe:
+                    self._healthy = 0
+                    self.rate = min(self.max_rate, self.rate + self.step)
+
+    def stats(self):
+        """Return the current rate limit and the achieved rate (overall and over the last seconds)."""
+        with self._lock:
+            now = time.monotonic()
+            recent = [t for t in self._recent if t >= now - WINDOW]
+            elapsed = now - self._first if self._first is not None else 0.0
+            return {
+                "rate": round(self.rate, 2),
+                "achieved": round(self._stats["requests"] / elapsed, 2) if elapsed > 0 else 0.0,
+                "recent": round(len(recent) / min(WINDOW, elapsed), 2) if elapsed > 0 else 0.0,
+                "requests": self._stats["requests"],
+                "throttled": self._stats["throttled"],
+                "waited": round(self._stats["waited"], 2),
+            }
@@ -0,0 +1,331 @@
+"""Local HTTP render service that keeps scraper, template and caches warm.
+
+Start it once with ``python render_service.py`` and let the GUI and scripts
+send their requests to it, instead of starting a new Python process (and new
+connections) for every datasheet.
+
+Endpoints:
+
+* ``GET  /render?source=<url or part number>&lang=de`` waits and returns the PDF
+  (``422`` with the job status if rendering failed)
+* ``POST /jobs`` with ``{"source": ..., "lang": ...}`` queues a job and returns its status
+* ``GET  /jobs/<id>`` returns the job status, ``GET /jobs/<id>/pdf`` the finished PDF
+  (``409`` while it is queued or running, ``422`` if it failed)
+* ``GET  /stats`` returns queue and cache counters
+
+A full queue is answered with ``503`` and ``Retry-After``.
+"""
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+
+from utils import extract_language, language_url
+
+# === Service settings ===
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("EMICO_SERVICE_PORT", "8765"))
+WORKERS = 2
+QUEUE_SIZE = 32
+KEEP_RESULTS = 64
+RENDER_TIMEOUT = 300
+
+
+class ServiceBusy(Exception):
+    pass
+
+
+class Job:
+    """One render request and its result."""
+
+    def __init__(self, job_id, source, lang):
+        self.id = job_id
+        self.source = source
+        self.lang = lang
+        self.status = "queued"
+        self.error = None
+        self.filename = None
+        self.pdf = None
+        self.created = time.time()
+        self.seconds = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "source": self.source,
+            "lang": self.lang,
+            "status": self.status,
+            "error": self.error,
+            "filename": self.filename,
+            "seconds": self.seconds,
+        }
+
+
+def resolve_url(source, lang=None):
+    """Return ``(url, lang)`` for a product URL or part number, switched to ``lang`` if given."""
+    source = str(source).strip()
+    if "://" in source:
+        url = source
+    else:
+        import part_index
+        url = part_index.load_index().lookup(source, lang) or part_index.resolve(source)
+    url_lang = extract_language(url)
+    if lang and lang != url_lang:
+        url = language_url(url, lang)
+        if not url:
+            raise LookupError(f"No {lang} URL for {source}")
+    return url, lang or url_lang
+
+
+class RenderService:
+    """Worker threads rendering queued jobs with the warm in-process caches."""
+
+    def __init__(self, workers=WORKERS, queue_size=QUEUE_SIZE, save_folder=None, cache_mode=None):
+        self.workers = workers
+        self.save_folder = save_folder
+        self.cache_mode = cache_mode
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads = []
+        self._counts = {"done": 0, "failed": 0, "rejected": 0}
+
+    def start(self):
+        from datasheet_template import get_template
+        get_template()
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, source, lang=None):
+        """Queue a render job; raises ``ServiceBusy`` if the queue is full."""
+        job = Job(str(next(self._ids)), str(source).strip(), lang)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise ServiceBusy("Render queue is full") from None
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _forget_old_jobs(self):
+        # keep the newest finished results, never drop queued or running jobs
+        finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+        for job_id in finished[:max(len(finished) - KEEP_RESULTS, 0)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        from main import get_emico_data
+        from pdf_generator import render_emico_pdf
+        from datasheet_template import get_template
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = "running"
+            start = time.perf_counter()
+            try:
+                url, lang = resolve_url(job.source, job.lang)
+                record = get_emico_data(url, cache_mode=self.cache_mode, lang=lang)
+                job.lang = lang
+                job.pdf = render_emico_pdf(*record)
+                job.filename = os.path.basename(get_template().output_filename(record[0], lang, ""))
+                if self.save_folder:
+                    with open(os.path.join(self.save_folder, job.filename), "wb") as f:
+                        f.write(job.pdf)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+            job.seconds = round(time.perf_counter() - start, 3)
+            with self._lock:
+                self._counts[job.status] += 1
+            job.done.set()
+
+    def stats(self):
+        import http_cache
+        import http_client
+        import image_cache
+
+        with self._lock:
+            counts = dict(self._counts)
+        counts["queued"] = self._queue.qsize()
+        return {
+            "jobs": counts,
+            "http": http_client.stats(),
+            "pages": http_cache.stats(),
+            "images": image_cache.stats(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_pdf(self, job):
+        disposition = f"inline; filename*=UTF-8''{quote(job.filename)}"
+        self._send(200, job.pdf, "application/pdf", {"Content-Disposition": disposition})
+
+    def _submit(self, source, lang):
+        if not source:
+            self._send(400, {"error": "source is required"})
+            return None
+        try:
+            return self.service.submit(source, lang or None)
+        except ServiceBusy as e:
+            self._send(503, {"error": str(e)}, headers={"Retry-After": "1"})
+            return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if parts == ["render"]:
+            job = self._submit(query.get("source"), query.get("lang"))
+            if job is None:
+                return
+            job.done.wait(RENDER_TIMEOUT)
+            if job.status == "done":
+                self._send_pdf(job)
+            elif job.status == "failed":
+                # not a 5xx: clients would retry and render the same failure again
+                self._send(422, job.to_dict())
+            else:
+                self._send(202, job.to_dict())
+        elif parts == ["stats"]:
+            self._send(200, self.service.stats())
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["pdf"]):
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send(404, {"error": "unknown job"})
+            elif parts[2:] == ["pdf"]:
+                if job.status == "done":
+                    self._send_pdf(job)
+                elif job.status == "failed":
+                    self._send(422, job.to_dict())
+                else:
+                    self._send(409, job.to_dict())
+            else:
+                self._send(200, job.to_dict())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+        if not isinstance(payload, dict):
+            self._send(400, {"error": "expected a JSON object"})
+            return
+        job = self._submit(payload.get("source"), payload.get("lang"))
+        if job is not None:
+            self._send(202, job.to_dict())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(service, host=HOST, port=PORT):
+    """Return an HTTP server bound to ``host:port`` serving ``service`` (port 0 picks a free one)."""
+    handler = type("Handler", (_Handler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def render_remote(source, lang=None, server=None, deadline=2 * RENDER_TIMEOUT):
+    """Thin client: render through a running service and return the PDF bytes.
+
+    Raises ``RuntimeError`` if the job failed and ``TimeoutError`` if it is
+    not finished ``deadline`` seconds after it was submitted.
+    """
+    import http_client
+
+    server = server or f"http://{HOST}:{PORT}"
+    params = {"source": source}
+    if lang:
+        params["lang"] = lang
+    timeout = (http_client.CONNECT_TIMEOUT, RENDER_TIMEOUT + 10)
+    give_up = time.monotonic() + deadline
+    # not retried: a retry after a read timeout would queue the same job again
+    response = http_client.fetch(f"{server}/render?{urlencode(params)}", timeout=timeout, retries=0)
+    if response.status_code == 202:
+        # still running after RENDER_TIMEOUT: poll the job instead of queueing it again
+        job_url = f"{server}/jobs/{response.json()['id']}"
+        while True:
+            response = http_client.fetch(job_url, timeout=timeout)
+            if response.status_code != 200 or response.json()["status"] not in ("queued", "running"):
+                break
+            if time.monotonic() > give_up:
+                raise TimeoutError(f"Render job {job_url} not finished after {deadline}s")
+            time.sleep(1)
+        if response.status_code == 200:
+            # done or failed; a failed job is answered with 422 and its error
+            response = http_client.fetch(f"{job_url}/pdf", timeout=timeout)
+    if response.status_code != 200:
+        raise RuntimeError(response.json().get("error") or f"Render service returned {response.status_code}")
+    return response.content
+
+
+# === Standalone Run Mode ===
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Emico datasheet render service")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--output", help="also save every PDF into this folder")
+    args = parser.parse_args()
+
+    service = RenderService(args.workers, args.queue_size, save_folder=args.output).start()
+    server = make_server(service, args.host, args.port)
+    print(f"🔹 Emico render service on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
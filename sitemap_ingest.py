@@ -0,0 +1,149 @@
+"""Keep the part number -> URL index up to date from the emico.com sitemap.
+
+Sitemaps and sitemap index files are parsed with ``iterparse`` and every
+``<url>`` is dropped right after it has been read, so memory stays flat
+however large the sitemap is. A sitemap whose ``lastmod`` in the index is
+unchanged is not downloaded again; within a sitemap only new, changed and
+removed ``loc`` entries touch the index. The result is stored next to the
+pickled sheet index and picked up by ``part_index.load_index``.
+"""
+import gzip
+import io
+import os
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import http_client
+import part_index
+from utils import extract_language
+
+SITEMAP_URL = os.environ.get("EMICO_SITEMAP_URL", "https://www.emico.com/sitemap.xml")
+
+
+def _open(source):
+    """Open a sitemap URL or file as a binary stream, unpacking ``.xml.gz``."""
+    if source.startswith(("http://", "https://")):
+        response = http_client.fetch(source)
+        response.raise_for_status()
+        stream = io.BytesIO(response.content)
+    else:
+        stream = open(source, "rb")
+    magic = stream.read(2)
+    stream.seek(0)
+    return gzip.GzipFile(fileobj=stream) if magic == b"\x1f\x8b" else stream
+
+
+def iter_sitemap(source):
+    """Yield ``(kind, loc, lastmod)`` per entry; ``kind`` is "sitemap" in an index and "url" in a urlset."""
+    with _open(source) as stream:
+        root = None
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if root is None:
+                root = elem
+                continue
+            if event != "end":
+                continue
+            kind = elem.tag.rpartition("}")[2]
+            if kind not in ("url", "sitemap"):
+                continue
+            fields = {child.tag.rpartition("}")[2]: (child.text or "").strip() for child in elem}
+            if fields.get("loc"):
+                yield kind, fields["loc"], fields.get("lastmod") or None
+            # finished entries are not needed any more
+            root.clear()
+
+
+def _empty_state():
+    return {"sitemaps": {}, "entries": {}, "updated": None}
+
+
+def _reachable(state, url, found):
+    """Collect ``url`` and the child sitemaps recorded under it."""
+    if url in found:
+        return
+    found.add(url)
+    for child in state["sitemaps"].get(url, {}).get("children", ()):
+        _reachable(state, child, found)
+
+
+def _set_entry(entries, loc, remove=False):
+    lang = extract_language(loc)
+    key = part_index.part_number_from_url(loc)
+    if not lang or not key:
+        return False
+    if remove:
+        urls = entries.get(key, {})
+        if urls.get(lang) == loc:
+            del urls[lang]
+            if not urls:
+                del entries[key]
+    else:
+        entries.setdefault(key, {})[lang] = loc
+    return True
+
+
+def _apply(entries, old_locs, new_locs, counts):
+    for loc in old_locs.keys() - new_locs.keys():
+        if _set_entry(entries, loc, remove=True):
+            counts["removed"] += 1
+    for loc, lastmod in new_locs.items():
+        if loc in old_locs and lastmod is not None and old_locs[loc] == lastmod:
+            counts["unchanged"] += 1
+        elif not _set_entry(entries, loc):
+            counts["ignored"] += 1
+        else:
+            counts["updated" if loc in old_locs else "added"] += 1
+
+
+def ingest(source=SITEMAP_URL, full=False):
+    """Refresh the ingested sitemap entries from ``source`` (a sitemap or sitemap index); returns the counts.
+
+    ``full`` ignores the stored state and reads every sitemap again.
+    """
+    state = (None if full else part_index.read_sitemap_state()) or _empty_state()
+    counts = Counter()
+    reachable = set()
+    pending = [(source, None)]
+    while pending:
+        url, lastmod = pending.pop()
+        previous = state["sitemaps"].get(url)
+        if previous is not None and lastmod is not None and previous["lastmod"] == lastmod:
+            counts["sitemaps_unchanged"] += 1
+            _reachable(state, url, reachable)
+            continue
+        reachable.add(url)
+        counts["sitemaps_read"] += 1
+        locs, children = {}, []
+        for kind, loc, entry_lastmod in iter_sitemap(url):
+            if kind == "sitemap":
+                children.append(loc)
+                pending.append((loc, entry_lastmod))
+            else:
+                locs[loc] = entry_lastmod
+        _apply(state["entries"], previous["locs"] if previous else {}, locs, counts)
+        state["sitemaps"][url] = {"lastmod": lastmod, "locs": locs, "children": children}
+
+    # sitemaps that dropped out of the index take their URLs with them
+    for url in set(state["sitemaps"]) - reachable:
+        _apply(state["entries"], state["sitemaps"].pop(url)["locs"], {}, counts)
+
+    if full or counts.keys() & {"added", "updated", "removed"} or state["updated"] is None:
+        state["updated"] = time.time()
+        part_index.write_sitemap_state(state)
+    counts["part_numbers"] = len(state["entries"])
+    return dict(counts)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update the part number index from the emico.com sitemap")
+    parser.add_argument("--sitemap", default=SITEMAP_URL, help="sitemap or sitemap index (URL or file)")
+    parser.add_argument("--full", action="store_true", help="read all sitemaps again")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = ingest(args.sitemap, full=args.full)
+    print("🗺️ " + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+    print(f"✅ Sitemap ingested in {time.perf_counter() - start:.1f}s")
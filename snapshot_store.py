@@ -0,0 +1,191 @@
+"""Append-only store of scraped product records for rendering without the website.
+
+Every snapshot is one JSON line, compressed as its own gzip member, so the
+file stays a valid ``.jsonl.gz`` (``zcat`` reads it) and a single record can
+be read by seeking to its offset. A SQLite index next to it maps
+``(artikelnummer, lang)`` to the offsets of its snapshots. Lines written
+after the last index commit (or a truncated last line after a crash) are
+picked up or cut off when the store is opened.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from part_index import normalize_part_number
+from product_record import ProductRecord
+from utils import sqlite_journal_mode
+
+STORE_NAME = "emico_snapshots.jsonl.gz"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    artikelnummer TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    offset INTEGER NOT NULL PRIMARY KEY,
+    length INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    url TEXT,
+    scraped_at REAL
+);
+CREATE INDEX IF NOT EXISTS snapshots_key ON snapshots (artikelnummer, lang, offset);
+"""
+
+
+def _digest(record):
+    data = json.dumps(record.to_dict(), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _members(data, offset=0):
+    """Yield ``(offset, length, line)`` for each complete gzip member in ``data``."""
+    position = 0
+    while position < len(data):
+        inflater = zlib.decompressobj(wbits=31)
+        try:
+            line = inflater.decompress(data[position:])
+        except zlib.error:
+            return
+        if not inflater.eof:
+            return
+        length = len(data) - position - len(inflater.unused_data)
+        yield offset + position, length, line
+        position += length
+
+
+class SnapshotStore:
+    """Snapshots of ``ProductRecord``s keyed by article number and language; the latest one wins."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(f"{self.path}.idx.sqlite")
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(f"PRAGMA journal_mode={sqlite_journal_mode(self.path)}")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._file = open(self.path, "ab+")
+        self._catch_up()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+        self._db.close()
+
+    def _catch_up(self):
+        """Index lines written after the last commit and cut off a truncated last line."""
+        row = self._db.execute("SELECT MAX(offset + length) FROM snapshots").fetchone()
+        end = row[0] or 0
+        size = os.path.getsize(self.path)
+        if size == end:
+            return
+        if size < end:
+            raise ValueError(f"{self.path} is shorter than its index; delete {self.path}.idx.sqlite to rebuild it")
+        self._file.seek(end)
+        for offset, length, line in _members(self._file.read(), end):
+            entry = json.loads(line)
+            record = ProductRecord.from_dict(entry["record"])
+            self._index(record, offset, length, entry.get("url"), entry.get("scraped_at"))
+            end = offset + length
+        if end < size:
+            self._file.truncate(end)
+        self._db.commit()
+
+    def _index(self, record, offset, length, url, scraped_at):
+        self._db.execute(
+            "INSERT OR REPLACE INTO snapshots (artikelnummer, lang, offset, length, digest, url, scraped_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (normalize_part_number(record.artikelnummer), record.lang, offset, length, _digest(record),
+             url, scraped_at),
+        )
+
+    def _latest(self, artikelnummer, lang):
+        return self._db.execute(
+            "SELECT * FROM snapshots WHERE artikelnummer = ? AND lang = ? ORDER BY offset DESC LIMIT 1",
+            (normalize_part_number(artikelnummer), lang),
+        ).fetchone()
+
+    def add(self, record, url=None):
+        """Append a snapshot unless it equals the latest one of the product; returns True if it was appended."""
+        record = ProductRecord.from_tuple(record)
+        if not record.artikelnummer:
+            raise ValueError("Record has no artikelnummer")
+        latest = self._latest(record.artikelnummer, record.lang)
+        if latest is not None and latest["digest"] == _digest(record):
+            return False
+        scraped_at = time.time()
+        line = json.dumps({"url": url, "scraped_at": scraped_at, "record": record.to_dict()}, ensure_ascii=False)
+        member = gzip.compress(line.encode("utf-8") + b"\n")
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(member)
+        self._file.flush()
+        self._index(record, offset, len(member), url, scraped_at)
+        self._db.commit()
+        return True
+
+    def _read(self, row):
+        self._file.seek(row["offset"])
+        entry = json.loads(gzip.decompress(self._file.read(row["length"])))
+        return ProductRecord.from_dict(entry["record"])
+
+    def get(self, artikelnummer, lang):
+        """Return the latest ``ProductRecord`` of a product, or None."""
+        row = self._latest(artikelnummer, lang)
+        return self._read(row) if row is not None else None
+
+    def history(self, artikelnummer, lang):
+        """Return ``(scraped_at, record)`` of all snapshots of a product, oldest first."""
+        rows = self._db.execute(
+            "SELECT * FROM snapshots WHERE artikelnummer = ? AND lang = ? ORDER BY offset",
+            (normalize_part_number(artikelnummer), lang),
+        ).fetchall()
+        return [(row["scraped_at"], self._read(row)) for row in rows]
+
+    def keys(self, lang=None):
+        """Return the ``(artikelnummer, lang)`` pairs in the store."""
+        query = "SELECT DISTINCT artikelnummer, lang FROM snapshots"
+        rows = self._db.execute(query + " WHERE lang = ?", (lang,)) if lang else self._db.execute(query)
+        return [tuple(row) for row in rows]
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM (SELECT DISTINCT artikelnummer, lang FROM snapshots)").fetchone()[0]
+
+    def records(self, lang=None):
+        """Yield the latest record of every product (of ``lang``), in the order they were stored."""
+        query = "SELECT *, MAX(offset) FROM snapshots{} GROUP BY artikelnummer, lang ORDER BY offset"
+        rows = (self._db.execute(query.format(" WHERE lang = ?"), (lang,)) if lang
+                else self._db.execute(query.format("")))
+        # the rows are fetched first: reading a record moves the shared file position
+        for row in rows.fetchall():
+            yield self._read(row)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render datasheets from stored snapshots, without the website")
+    parser.add_argument("store", help=f"snapshot file, e.g. {STORE_NAME}")
+    parser.add_argument("--output", help="render all latest snapshots into this folder")
+    parser.add_argument("--lang", help="only this language")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    with SnapshotStore(args.store) as store:
+        print(f"🔹 {len(store)} products in {args.store}")
+        if args.output:
+            from batch_render import render_batch
+
+            os.makedirs(args.output, exist_ok=True)
+            for record, output, error, seconds in render_batch(store.records(args.lang), args.output, args.workers):
+                if error is not None:
+                    print(f"❌ {record[0].get('artikelnummer')}: {error}")
+                else:
+                    print(f"✅ {output} ({seconds:.1f}s)")
@@ -0,0 +1,117 @@
+"""``archive_export``: recovery from local headers, checkpoints and compaction."""
+import os
+import zipfile
+
+import pytest
+
+import archive_export
+from archive_export import ZipExporter, _complete_entries, recover_archive
+
+ENTRIES = {
+    "de/1_Datenblatt.pdf": b"%PDF-1.4 de " * 50,
+    "en/1_Datasheet.pdf": b"%PDF-1.4 en " * 80,
+    "fr/1_Fiche.pdf": b"%PDF-1.4 fr " * 30,
+}
+
+
+def _write_zip(path, compression=zipfile.ZIP_STORED):
+    with zipfile.ZipFile(path, "w", compression=compression) as archive:
+        for name, data in ENTRIES.items():
+            archive.writestr(name, data)
+    with zipfile.ZipFile(path) as archive:
+        return archive.start_dir
+
+
+def _cut(path, size):
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_complete_entries_without_central_directory(tmp_path, compression):
+    path = tmp_path / "a.zip"
+    start_dir = _write_zip(path, compression)
+    _cut(path, start_dir)
+    entries = list(_complete_entries(path))
+    assert [(name, method) for name, method, _ in entries] == [(name, compression) for name in ENTRIES]
+    if compression == zipfile.ZIP_STORED:
+        assert [data for _, _, data in entries] == list(ENTRIES.values())
+
+
+def test_complete_entries_stops_at_a_cut_entry(tmp_path):
+    path = tmp_path / "a.zip"
+    _cut(path, _write_zip(path) - 10)
+    assert [name for name, _, _ in _complete_entries(path)] == list(ENTRIES)[:-1]
+
+
+def test_complete_entries_stops_at_garbage(tmp_path):
+    path = tmp_path / "a.zip"
+    start_dir = _write_zip(path)
+    with open(path, "r+b") as f:
+        f.seek(start_dir)
+        f.write(b"\0" * 100)
+        f.truncate()
+    assert [name for name, _, _ in _complete_entries(path)] == list(ENTRIES)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_recover_archive(tmp_path, compression):
+    path = tmp_path / "a.zip"
+    _cut(path, _write_zip(path, compression) - 10)
+    assert not zipfile.is_zipfile(path)
+    assert recover_archive(path) == 2
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert {name: archive.read(name) for name in archive.namelist()} == dict(list(ENTRIES.items())[:2])
+
+
+def test_archive_is_valid_between_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_export, "CHECKPOINT_ENTRIES", 2)
+    path = tmp_path / "a.zip"
+    checkpoints = []
+    exporter = ZipExporter(path, on_checkpoint=checkpoints.append)
+    assert zipfile.is_zipfile(path)
+    for name, data in ENTRIES.items():
+        lang, filename = name.split("/")
+        exporter.add(lang, filename, data)
+    # not closed: as if the process had been killed here
+    assert checkpoints == [list(ENTRIES)[:2]]
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == list(ENTRIES)[:2]
+
+    with ZipExporter(path) as resumed:
+        assert list(ENTRIES)[1] in resumed
+        assert list(ENTRIES)[2] not in resumed
+        assert resumed.add("de", "1_Datenblatt.pdf", b"again") is None
+        resumed.add("fr", "1_Fiche.pdf", ENTRIES["fr/1_Fiche.pdf"])
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == list(ENTRIES)
+
+
+def test_resume_after_kill_during_checkpoint(tmp_path):
+    path = tmp_path / "a.zip"
+    _cut(path, _write_zip(path) + 20)
+    with ZipExporter(path) as exporter:
+        assert all(name in exporter for name in ENTRIES)
+        exporter.add("it", "1_Scheda.pdf", b"%PDF-1.4 it")
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == [*ENTRIES, "it/1_Scheda.pdf"]
+
+
+def test_replaced_entries_are_compacted(tmp_path):
+    path = tmp_path / "a.zip"
+    with ZipExporter(path) as exporter:
+        for name, data in ENTRIES.items():
+            exporter.add(*name.split("/"), data)
+    for month in range(3):
+        with ZipExporter(path) as exporter:
+            exporter.add("en", "1_Datasheet.pdf", b"%PDF-1.4 new " * 80 + bytes([month]), replace=True)
+        with zipfile.ZipFile(path) as archive:
+            assert len(archive.namelist()) <= len(ENTRIES) + 1
+            assert archive.read("en/1_Datasheet.pdf").endswith(bytes([month]))
+    with ZipExporter(path) as exporter:
+        exporter.compact()
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == sorted(ENTRIES)
+        assert archive.read("de/1_Datenblatt.pdf") == ENTRIES["de/1_Datenblatt.pdf"]
+    assert os.path.getsize(path) < 4000
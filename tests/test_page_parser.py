@@ -0,0 +1,38 @@
+"""``page_parser`` against the saved product pages of ``benchmarks/fixtures``.
+
+``fixtures/pages/expected.json`` holds what the original BeautifulSoup
+scraper extracted from these pages, so the selective parser has to keep
+producing the same records.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from page_parser import parse_emico_page
+from utils import LANGUAGES
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ROOT / "benchmarks" / "fixtures"
+EXPECTED = json.loads((Path(__file__).parent / "fixtures" / "pages" / "expected.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("lang", LANGUAGES)
+def test_parse_product_page(lang):
+    html = (PAGES / f"product_{lang}.html").read_text(encoding="utf-8")
+    basic_info, base_specs, technical_specs, drawing_data, clean_links = parse_emico_page(html, lang)
+    expected = EXPECTED[lang]
+    assert basic_info == expected["basic_info"]
+    # key order is the row order of the spec tables
+    assert list(base_specs.items()) == list(expected["base_specs"].items())
+    assert list(technical_specs.items()) == list(expected["technical_specs"].items())
+    assert list(drawing_data.items()) == list(expected["drawing_data"].items())
+    assert sorted(clean_links) == expected["image_links"]
+
+
+def test_parse_is_repeatable():
+    # the precompiled selectors are shared between calls and languages
+    html = (PAGES / "product_de.html").read_text(encoding="utf-8")
+    first = parse_emico_page(html, "de")
+    parse_emico_page((PAGES / "product_en.html").read_text(encoding="utf-8"), "en")
+    assert parse_emico_page(html, "de")[:4] == first[:4]
@@ -0,0 +1,129 @@
+"""``sitemap_ingest`` against the sitemap fixtures served as www.emico.com.
+
+``fixtures/sitemaps/v1`` is the first state of the site; in ``v2`` one
+child sitemap changed, one is unchanged (and missing, so reading it would
+fail) and one dropped out of the index.
+"""
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import http_client
+import part_index
+import sitemap_ingest
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "sitemaps"
+SITEMAP = "https://www.emico.com/sitemap.xml"
+
+
+def _url(lang, part_number):
+    return f"https://www.emico.com/{lang}-DE/emico/o-ring-{part_number}"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    handler = functools.partial(_QuietHandler, directory=str(FIXTURE_DIR))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def site(server, tmp_path, monkeypatch):
+    """Serve ``site(<version>)`` of the fixtures as www.emico.com, with the index caches in ``tmp_path``."""
+    monkeypatch.setenv("EMICO_CACHE_DIR", str(tmp_path / "cache"))
+    # the cache paths are set on import
+    monkeypatch.setattr(part_index, "CACHE_DIR", tmp_path / "cache" / "index")
+    monkeypatch.setattr(part_index, "SITEMAP_CACHE", tmp_path / "cache" / "index" / "sitemap.pickle")
+    monkeypatch.setattr(http_client, "RATE_LIMIT", False)
+
+    def serve(version):
+        monkeypatch.setattr(http_client, "HOST_OVERRIDES", {"https://www.emico.com": f"{server}/{version}"})
+    return serve
+
+
+def _entries():
+    return part_index.read_sitemap_state()["entries"]
+
+
+def test_urlset_file():
+    entries = list(sitemap_ingest.iter_sitemap(str(FIXTURE_DIR / "v1" / "products-1.xml")))
+    assert entries[0] == ("url", _url("de", 300000001), "2024-01-01")
+    assert entries[-1] == ("url", "https://www.emico.com/de-DE/emico/kontakt", None)
+    assert len(entries) == 4
+
+
+def test_gzipped_sitemap():
+    entries = list(sitemap_ingest.iter_sitemap(str(FIXTURE_DIR / "v1" / "products-2.xml.gz")))
+    assert [loc for _, loc, _ in entries] == [_url("de", 300000003), _url("de", 300000004)]
+
+
+def test_first_ingest(site):
+    site("v1")
+    counts = sitemap_ingest.ingest(SITEMAP)
+    assert counts == {"sitemaps_read": 4, "added": 6, "ignored": 1, "part_numbers": 5}
+    assert _entries()["300000001"] == {"de": _url("de", 300000001), "en": _url("en", 300000001)}
+    assert _entries()["300000003"] == {"de": _url("de", 300000003)}
+
+
+def test_unchanged_lastmod_is_skipped(site):
+    site("v1")
+    sitemap_ingest.ingest(SITEMAP)
+    stored = part_index.SITEMAP_CACHE.stat().st_mtime_ns
+    counts = sitemap_ingest.ingest(SITEMAP)
+    # only the index itself (it has no lastmod) is read again
+    assert counts == {"sitemaps_read": 1, "sitemaps_unchanged": 3, "part_numbers": 5}
+    assert part_index.SITEMAP_CACHE.stat().st_mtime_ns == stored
+
+
+def test_changes(site):
+    site("v1")
+    sitemap_ingest.ingest(SITEMAP)
+    site("v2")
+    counts = sitemap_ingest.ingest(SITEMAP)
+    # 300000002 left products-1.xml, 300000005 went with extra.xml
+    assert counts == {"sitemaps_read": 2, "sitemaps_unchanged": 1, "added": 1, "updated": 1, "removed": 2,
+                      "unchanged": 1, "ignored": 1, "part_numbers": 4}
+    assert sorted(_entries()) == ["300000001", "300000003", "300000004", "300000006"]
+    assert "extra.xml" not in " ".join(part_index.read_sitemap_state()["sitemaps"])
+
+
+def test_full_reads_everything_again(site):
+    site("v1")
+    sitemap_ingest.ingest(SITEMAP)
+    counts = sitemap_ingest.ingest(SITEMAP, full=True)
+    assert counts["sitemaps_read"] == 4
+    assert counts["added"] == 6
+
+
+def test_sitemap_overrides_sheet(site, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    link_file = tmp_path / "links.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = part_index.SHEET_NAME
+    sheet.append(["loc", "Spalte1"])
+    sheet.append(["https://www.emico.com/de-DE/emico/alt-300000001", "300000001"])
+    sheet.append(["https://www.emico.com/fr-DE/emico/alt-300000001", "300000001"])
+    sheet.append([_url("de", 300000099), "300000099"])
+    workbook.save(link_file)
+
+    site("v1")
+    assert part_index.load_index(link_file).lookup("300000001", "de").endswith("/alt-300000001")
+    sitemap_ingest.ingest(SITEMAP)
+    index = part_index.load_index(link_file)
+    # the sitemap replaces the sheet per language; languages and part numbers only in the sheet stay
+    assert index.urls("300000001") == {"de": _url("de", 300000001), "en": _url("en", 300000001),
+                                       "fr": "https://www.emico.com/fr-DE/emico/alt-300000001"}
+    assert index.lookup("300000099") == _url("de", 300000099)
+    assert index.lookup("300000005") == _url("de", 300000005)
@@ -0,0 +1,190 @@
+"""Per-stage timing of scraping and rendering a datasheet.
+
+Code marks its stages with ``stage("fetch")``; inside an active ``trace``
+each stage adds its wall time and counters (bytes, images, ...) to the
+trace, outside of one it costs next to nothing. A finished trace can be
+printed as a table and is appended as one JSON line to
+``EMICO_TIMING_LOG`` if that is set.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_PATH = os.environ.get("EMICO_TIMING_LOG")
+
+_current = contextvars.ContextVar("emico_trace", default=None)
+
+
+class Trace:
+    """Wall time and counters per stage of one run; stages may be recorded from several threads."""
+
+    def __init__(self, label, **fields):
+        self.label = label
+        self.fields = fields
+        self.stages = {}
+        self.seconds = 0.0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds=None, **counters):
+        with self._lock:
+            entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+            if seconds is not None:
+                entry["calls"] += 1
+                entry["seconds"] += seconds
+            for key, value in counters.items():
+                entry[key] = entry.get(key, 0) + value
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def to_dict(self):
+        with self._lock:
+            stages = {name: dict(entry, seconds=round(entry["seconds"], 4)) for name, entry in self.stages.items()}
+        return {"label": self.label, **self.fields, "time": time.time(), "seconds": round(self.seconds, 4),
+                "stages": stages}
+
+    def table(self):
+        """Return the stages as a text table; stages in worker threads overlap, so shares may exceed 100 %."""
+        lines = [f"{'stage':<16}{'calls':>6}{'seconds':>10}{'share':>8}  counters"]
+        for name, entry in sorted(self.stages.items(), key=lambda item: -item[1]["seconds"]):
+            share = entry["seconds"] / self.seconds * 100 if self.seconds else 0.0
+            counters = ", ".join(f"{k}={_human(k, v)}" for k, v in entry.items() if k not in ("calls", "seconds"))
+            lines.append(f"{name:<16}{entry['calls']:>6}{entry['seconds']:>10.3f}{share:>7.1f}%  {counters}")
+        lines.append(f"{'total':<16}{'':>6}{self.seconds:>10.3f}")
+        return "\n".join(lines)
+
+
+def _human(key, value):
+    if "bytes" in key and value >= 1024:
+        return f"{value / 1024:.1f}k"
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def trace(label, **fields):
+    """Record the stages run inside the block; nested traces record into the outer one."""
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    active = Trace(label, **fields)
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        _current.reset(token)
+        active.finish()
+        if LOG_PATH:
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(active.to_dict(), ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def stage(name, **counters):
+    """Time the block as stage ``name``; counters can be added to the yielded dict."""
+    active = _current.get()
+    counters = dict(counters)
+    if active is None:
+        yield counters
+        return
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        active.add(name, time.perf_counter() - start, **counters)
+
+
+def count(name, **counters):
+    """Add counters to stage ``name`` of the active trace without timing anything."""
+    active = _current.get()
+    if active is not None:
+        active.add(name, **counters)
+
+
+def bind(func):
+    """Wrap ``func`` so stages it runs in another thread are recorded in the current trace."""
+    active = _current.get()
+    if active is None:
+        return func
+
+    def run(*args, **kwargs):
+        token = _current.set(active)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+
+# === Profiling a single run ===
+@contextmanager
+def profile(output=None, memory=False, cpu=True, top=25):
+    """Run the block under cProfile (and tracemalloc if ``memory``) and print the hot spots.
+
+    ``output`` also saves the raw profile for ``snakeviz``/``pstats``.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    if memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if cpu else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield profiler
+    finally:
+        if profiler:
+            profiler.disable()
+            if output:
+                profiler.dump_stats(output)
+                print(f"📄 Profile saved to {output}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current_size, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"🧠 Memory: {current_size / 2**20:.1f} MiB now, {peak / 2**20:.1f} MiB peak")
+            for statistic in snapshot.statistics("lineno")[:10]:
+                print(f"   {statistic}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape and render one datasheet and show where the time goes")
+    parser.add_argument("url")
+    parser.add_argument("--output", default=".", help="folder for the PDF")
+    parser.add_argument("--cache-mode", help="fresh, revalidate or offline")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE",
+                        help="run under cProfile (and save the profile to FILE)")
+    parser.add_argument("--memory", action="store_true", help="trace allocations with tracemalloc")
+    parser.add_argument("--json", action="store_true", help="print the trace as JSON instead of a table")
+    args = parser.parse_args()
+
+    # the stages are recorded through the imported module, not through this __main__ copy of it
+    import timing
+    from main import get_emico_data
+    from pdf_generator import generate_emico_pdf
+
+    def run():
+        with timing.trace(args.url) as result:
+            record = get_emico_data(args.url, cache_mode=args.cache_mode)
+            generate_emico_pdf(*record, save_folder=args.output)
+        return result
+
+    if args.profile is not None or args.memory:
+        with timing.profile(args.profile or None, memory=args.memory, cpu=args.profile is not None):
+            result = run()
+    else:
+        result = run()
+    print(json.dumps(result.to_dict(), indent=2) if args.json else result.table())
@@ -135,7 +135,7 @@ class EmicoApp(ctk.CTk):
     def run_process(self, url):
         try:
             self.update_progress(0.3, "🔍 Produktdetails werden ausgelesen...")
-            basic_info, base_specs, technical_specs, drawing_data, clean_links,lang = get_emico_data(url)
+            record = get_emico_data(url)
 
             # === Speicherordner behandeln ===
             try:
@@ -154,7 +154,7 @@ class EmicoApp(ctk.CTk):
                 save_folder.mkdir(parents=True, exist_ok=True)
 
             self.update_progress(0.7, "🧾 PDF wird generiert...")
-            generate_emico_pdf(basic_info, base_specs, technical_specs, drawing_data, clean_links,lang, save_folder)
+            generate_emico_pdf(*record, save_folder=save_folder)
 
             self.update_progress(1.0, f"✅ PDF gespeichert in: {save_folder}")
             self.status_label.configure(text_color="#34C759")
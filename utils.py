@@ -1,4 +1,7 @@
+import os
 import sys
+import threading
+from concurrent.futures import wait, FIRST_COMPLETED
 from pathlib import Path
 import re
 def resource_path(relative_path):
@@ -9,6 +12,88 @@ def resource_path(relative_path):
         base_path = Path(__file__).parent
     return base_path / relative_path
 
+def cache_dir(name):
+    """Return the folder for a persistent cache (root: ``EMICO_CACHE_DIR`` or ``~/.emico_cache``)."""
+    base_path = Path(os.environ.get("EMICO_CACHE_DIR") or Path.home() / ".emico_cache")
+    return base_path / name
+
+def write_atomic(path, data):
+    """Write ``data`` to ``path`` through a temporary file, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def submit_bounded(items, submit, limit):
+    """Call ``submit(item)`` for each item, keeping at most ``limit`` futures pending.
+
+    ``items`` is consumed lazily. Yields ``(item, future)`` in completion
+    order; the next item is submitted once the consumer has taken a result.
+    """
+    items = iter(items)
+    pending = {}
+
+    def submit_next():
+        for item in items:
+            pending[submit(item)] = item
+            return True
+        return False
+
+    while len(pending) < limit and submit_next():
+        pass
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            yield item, future
+            submit_next()
+
+# file systems SQLite cannot lock reliably (and does not support WAL on)
+_NETWORK_FILESYSTEMS = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "davfs", "fuse.sshfs")
+
+def is_network_path(path):
+    """Tell whether ``path`` is on a network share (UNC path, mapped network drive, NFS/SMB mount)."""
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):
+            return True
+        import ctypes
+        drive_remote = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(path)[0] + "\\") == drive_remote
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return False
+    best, fstype = "", None
+    for mount_point, mount_fstype in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if os.path.commonpath([path, mount_point]) == mount_point and len(mount_point) >= len(best):
+            best, fstype = mount_point, mount_fstype
+    return fstype in _NETWORK_FILESYSTEMS
+
+def sqlite_journal_mode(path):
+    """Return "WAL" for a SQLite database at ``path``, or "DELETE" on a network share, where WAL is unsupported."""
+    return "DELETE" if is_network_path(path) else "WAL"
+
+LANGUAGES = ("de", "en", "fr", "es", "it")
+
 def extract_language(url):
     match = re.search(r'/(..)-DE/emico', url)
     return match.group(1) if match else None
+
+def language_url(url, lang):
+    """Swap the language of an Emico URL (``/de-DE/emico`` -> ``/en-DE/emico``); None if it has none."""
+    if not extract_language(url):
+        return None
+    return re.sub(r'/(..)-DE/emico', f'/{lang}-DE/emico', url, count=1)